@@ -0,0 +1,38 @@
+"""
+API data models, split by use case and loaded lazily.
+
+Importing this package defines no models; each submodule is imported on first
+attribute access, so a process that only serves /health never builds the
+podcast or voice models.
+"""
+from importlib import import_module
+
+_SUBMODULES = {
+    "VoiceId": "create",
+    "PodcastCreateInput": "create",
+    "PodcastCreateOutput": "create",
+    "PodcastCreate": "create",
+    "PodcastStatusValue": "response",
+    "Source": "response",
+    "PodcastMetadata": "response",
+    "PodcastResponse": "response",
+    "PodcastStatus": "response",
+    "ErrorResponse": "response",
+    "Voice": "voice",
+    "VoiceList": "voice",
+    "HealthCheck": "health",
+}
+
+__all__ = list(_SUBMODULES)
+
+def __getattr__(name):
+    try:
+        submodule = _SUBMODULES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(f".{submodule}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
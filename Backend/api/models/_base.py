@@ -0,0 +1,18 @@
+import sys
+from pydantic import BaseModel, Extra
+from pydantic.validators import str_validator
+
+class _ResponseModel(BaseModel):
+    """Base for read-only response models"""
+
+    class Config:
+        frozen = True
+        extra = Extra.forbid
+
+class InternedStr(str):
+    """str type for low-cardinality values (source names, voice labels), interned on validation"""
+
+    @classmethod
+    def __get_validators__(cls):
+        yield str_validator
+        yield sys.intern
@@ -0,0 +1,43 @@
+from functools import lru_cache
+from pydantic import BaseModel, Extra, Field, conlist
+from pydantic.validators import str_validator
+
+# Voice IDs come from a small pool (the user's saved hosts), so repeated IDs resolve
+# from the cache and share one string instance. Failures raise and are not cached.
+@lru_cache(maxsize=512)
+def _check_voice_id(v: str) -> str:
+    # str_validator has already run, so v is a str and an empty one fails the length check
+    if len(v) < 10:  # ElevenLabs voice IDs are longer than 10 characters
+        raise ValueError("Invalid voice ID format")
+    return v
+
+class VoiceId(str):
+    """ElevenLabs voice ID type, validated by a shared module-level check"""
+
+    @classmethod
+    def __get_validators__(cls):
+        yield str_validator
+        yield _check_voice_id
+
+class _PodcastCreateBase(BaseModel):
+    """Data model for podcast creation requests"""
+    topics: conlist(str, min_items=1, max_items=20) = Field(..., description="List of topics to include in the podcast")
+    duration: int = Field(300, description="Target podcast duration in seconds", ge=60, le=3600)
+    host_voice: VoiceId = Field(..., description="ElevenLabs voice ID for main host")
+    co_host_voice: VoiceId = Field(..., description="ElevenLabs voice ID for co-host")
+    language: str = Field("english", description="Podcast language")
+
+    class Config:
+        extra = Extra.forbid
+
+# The subclasses share _PodcastCreateBase's docstring and field descriptions;
+# pydantic's schema reads the docstring with inspect.getdoc, which inherits it.
+
+class PodcastCreateOutput(_PodcastCreateBase):
+    pass
+
+class PodcastCreateInput(_PodcastCreateBase):
+    pass
+
+class PodcastCreate(_PodcastCreateBase):
+    user_id: str = Field(..., description="User ID")
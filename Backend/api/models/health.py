@@ -0,0 +1,7 @@
+from dataclasses import dataclass
+
+@dataclass(frozen=True)
+class HealthCheck:
+    """Data model for API health check response"""
+    status: str = "healthy"
+    version: str = ""
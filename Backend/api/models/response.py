@@ -0,0 +1,62 @@
+from pydantic import Extra, conlist
+from typing import List, Optional, Literal
+from dataclasses import dataclass
+from datetime import datetime
+from ._base import _ResponseModel, InternedStr
+
+# The response-side models below are built by the API from trusted data (Supabase rows,
+# our own metadata files, ElevenLabs responses). Route handlers create them with
+# ``Model.construct(...)``, which skips validation; FastAPI still validates the result
+# once against ``response_model`` when serializing. Only the PodcastCreate* models
+# are validated at the request boundary.
+
+# Mirrors the CHECK constraint on podcasts.status
+PodcastStatusValue = Literal["processing", "completed", "failed"]
+
+class Source(_ResponseModel):
+    """Data model for news sources"""
+    url: str
+    title: str
+    source: InternedStr
+
+class PodcastMetadata(_ResponseModel):
+    """Data model for podcast metadata"""
+    topics: List[str]
+    article_count: int
+    target_duration_seconds: int
+    target_word_count: int
+    sources: conlist(Source, max_items=200)
+    recording_date: datetime
+
+    class Config:
+        # Stored metadata also carries the raw news_articles list; drop it rather than fail
+        extra = Extra.ignore
+
+class PodcastResponse(_ResponseModel):
+    """Data model for podcast responses"""
+    podcast_id: str
+    status: PodcastStatusValue
+    topics: List[str] = []
+    url: Optional[str] = None
+    message: Optional[str] = None
+    created_at: Optional[datetime] = None
+    duration: Optional[int] = None
+    metadata: Optional[PodcastMetadata] = None
+    transcript: Optional[str] = None
+
+# PodcastStatus and ErrorResponse are tiny, always built server-side and have no
+# validators, so they are plain frozen dataclasses rather than BaseModels.
+# FastAPI still accepts them as response_model.
+
+@dataclass(frozen=True)
+class PodcastStatus:
+    """Data model for podcast status updates"""
+    status: PodcastStatusValue
+    progress: float
+    message: str
+
+@dataclass(frozen=True)
+class ErrorResponse:
+    """Data model for error responses"""
+    detail: str
+    code: str
@@ -0,0 +1,16 @@
+from typing import Optional, Dict
+from pydantic import conlist
+from ._base import _ResponseModel, InternedStr
+
+class Voice(_ResponseModel):
+    """Data model for ElevenLabs voice information"""
+    voice_id: str
+    name: str
+    category: Optional[InternedStr] = None
+    language: Optional[InternedStr] = None
+    gender: Optional[InternedStr] = None
+    labels: Dict[str, str] = {}
+
+class VoiceList(_ResponseModel):
+    """Data model for list of available voices"""
+    voices: conlist(Voice, max_items=1000)
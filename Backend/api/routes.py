@@ -1,25 +1,158 @@
 from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, Query, Path, Response
-from typing import List, Optional
+from typing import FrozenSet, List, NamedTuple, Optional, Tuple
 from datetime import datetime
 import uuid
+import time
+import asyncio
 import os
+import re
 import logging
-import json
-import requests # Added for proxy request
-from fastapi.responses import JSONResponse, StreamingResponse # Added StreamingResponse
-from .models import PodcastCreate, PodcastResponse, PodcastStatus, ErrorResponse, HealthCheck, PodcastCreateInput
+import orjson
+import threading
+from functools import lru_cache
+import httpx
+from supabase import create_client, Client
+from fastapi.responses import ORJSONResponse, StreamingResponse # Added StreamingResponse
+from cachetools import TTLCache
+
+try:
+    from arq import create_pool
+    from arq.connections import RedisSettings
+    arq_available = True
+except ImportError:
+    arq_available = False
+from .models import PodcastCreate, PodcastResponse, PodcastStatus, ErrorResponse, HealthCheck, PodcastCreateInput, Voice
 from src.news_collector import NewsCollector
 from src.content_processor import ContentProcessor
 from src.chat import ChatBot
-from src.audio import AudioProcessor, merge_audio_segments
+from src.audio import get_audio_processor, merge_audio_segments
 from src.utils import load_config, validate_voice_id
+from .settings import Settings, get_settings
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 logger = logging.getLogger("ai-podcast-producer")
 
 # Load configuration
 config = load_config("config/podcast_config.yaml")
 
+# Shared service-role Supabase client, created on first use by get_supabase()
+_supabase_client: Optional[Client] = None
+_supabase_lock = threading.Lock()
+
+# Pooled async client for the ElevenLabs voice preview proxy
+_elevenlabs_client = httpx.AsyncClient(http2=True, timeout=20)
+PREVIEW_CHUNK_SIZE = 64 * 1024
+
+# One "Speaker: text" line of a script segment; blank and speaker-less lines don't match
+LINE_RE = re.compile(r'^([^:\n]+):[ \t]*(\S.*?)[ \t\r]*$', re.M)
+
+# Fixed intro/outro dialogue, synthesized alongside news collection
+INTRO_HOST_LINE = "Hello and welcome to TechTalk, your source for the latest in technology! I'm Alex, and with me today is Sarah."
+INTRO_COHOST_LINE = "Hi everyone! We've got some fascinating stories to discuss today."
+OUTRO_HOST_LINE = "And that wraps up our tech roundup for today. Thanks for joining us!"
+OUTRO_COHOST_LINE = "Don't forget to subscribe and leave us a review. See you next time!"
+
+# The voice list rarely changes and previews are immutable per voice, so both are kept in memory
+VOICES_CACHE_TTL = 3600
+_voices_cache = TTLCache(maxsize=1, ttl=VOICES_CACHE_TTL)
+_preview_cache = TTLCache(maxsize=256, ttl=86400)
+PREVIEW_CACHE_HEADERS = {"Cache-Control": "public, max-age=86400"}
+
+
+@router.on_event("startup")
+async def load_settings():
+    """Read the environment configuration once at startup rather than on the first request."""
+    get_settings()
+
+
+@router.on_event("shutdown")
+async def close_http_clients():
+    """Close pooled upstream HTTP connections on shutdown."""
+    await _elevenlabs_client.aclose()
+
+
+# The collector only holds API keys and HTTP clients, so one instance is shared by every
+# request instead of being rebuilt and re-validated per call (see also get_audio_processor).
+@lru_cache(maxsize=1)
+def get_news_collector() -> NewsCollector:
+    return NewsCollector()
+
+
+@lru_cache(maxsize=1)
+def get_content_processor() -> ContentProcessor:
+    return ContentProcessor()
+
+
+class _VoiceCatalog(NamedTuple):
+    voices: List[dict]
+    voices_json: bytes
+    voice_ids: FrozenSet[str]
+    voice_names: str
+
+
+def _load_voices() -> _VoiceCatalog:
+    """Return the ElevenLabs voice list and values derived from it, refreshed at most once per VOICES_CACHE_TTL."""
+    catalog = _voices_cache.get("voices")
+    if catalog is None:
+        voices = get_audio_processor().get_available_voices()
+        # Derive the /voices response body, the ID set used for validation and the list of
+        # voices shown in validation errors once per refresh instead of once per request
+        catalog = _VoiceCatalog(
+            voices=voices,
+            voices_json=orjson.dumps([{
+                "voice_id": voice["voice_id"],
+                "name": voice["name"],
+                "category": voice["category"],
+                "labels": voice.get("labels", {}),
+                # No longer need to construct sample_url here, frontend will use the new proxy endpoint
+                # "sample_url": f"https://api.elevenlabs.io/v1/voices/{voice['voice_id']}/preview"
+            } for voice in voices]),
+            voice_ids=frozenset(voice["voice_id"] for voice in voices),
+            voice_names=", ".join(f"{v['name']} ({v['voice_id']})" for v in voices)
+        )
+        # An empty list means the lookup failed; retry on the next request instead of caching it
+        if voices:
+            _voices_cache["voices"] = catalog
+    return catalog
+
+
+def get_cached_voices() -> List[dict]:
+    """Return the ElevenLabs voice list, refreshing it at most once per VOICES_CACHE_TTL."""
+    return _load_voices().voices
+
+
+def get_cached_voices_json() -> bytes:
+    """Return the pre-encoded JSON body served by /voices."""
+    return _load_voices().voices_json
+
+
+def get_supabase() -> Optional[Client]:
+    """Return the shared Supabase client, or None if Supabase is not configured."""
+    global _supabase_client
+    if _supabase_client is not None:
+        return _supabase_client
+
+    with _supabase_lock:
+        if _supabase_client is None:
+            settings = get_settings()
+            supabase_url = settings.supabase_url
+            supabase_service_key = settings.supabase_service_role_key
+
+            if not supabase_url:
+                logger.error("VITE_SUPABASE_URL is not set in environment variables")
+            if not supabase_service_key:
+                logger.error("SUPABASE_SERVICE_ROLE_KEY is not set in environment variables")
+            if not supabase_url or not supabase_service_key:
+                return None
+
+            # Log keys for debugging (mask part of the key)
+            masked_key = supabase_service_key[:10] + "..." + supabase_service_key[-5:] if len(supabase_service_key) > 15 else "***masked***"
+            logger.info(f"Using service role key: {masked_key}")
+
+            # Use the service role key instead of anon key to bypass RLS
+            _supabase_client = create_client(supabase_url, supabase_service_key)
+    return _supabase_client
+
 
 @router.post("/podcasts/", response_model=PodcastResponse, status_code=202)
 async def create_podcast(
@@ -31,25 +164,20 @@ async def create_podcast(
         # Generate unique ID for this podcast
         podcast_id = str(uuid.uuid4())
 
-        # Initialize audio processor and validate voices
-        audio_processor = AudioProcessor()
-
+        # Validate voices against the cached voice list
+        catalog = _load_voices()
         # Validate host voice
-        if not audio_processor.validate_voice_id(podcast_data.host_voice):
-            available_voices = audio_processor.get_available_voices()
-            voice_names = ", ".join(f"{v['name']} ({v['voice_id']})" for v in available_voices)
+        if podcast_data.host_voice not in catalog.voice_ids:
             raise HTTPException(
                 status_code=400,
-                detail=f"Invalid host voice ID: {podcast_data.host_voice}. Available voices: {voice_names}"
+                detail=f"Invalid host voice ID: {podcast_data.host_voice}. Available voices: {catalog.voice_names}"
             )
 
         # Validate co-host voice
-        if not audio_processor.validate_voice_id(podcast_data.co_host_voice):
-            available_voices = audio_processor.get_available_voices()
-            voice_names = ", ".join(f"{v['name']} ({v['voice_id']})" for v in available_voices)
+        if podcast_data.co_host_voice not in catalog.voice_ids:
             raise HTTPException(
                 status_code=400,
-                detail=f"Invalid co-host voice ID: {podcast_data.co_host_voice}. Available voices: {voice_names}"
+                detail=f"Invalid co-host voice ID: {podcast_data.co_host_voice}. Available voices: {catalog.voice_names}"
             )
 
         # Insert podcast data into Supabase
@@ -63,14 +191,13 @@ async def create_podcast(
             language=podcast_data.language
         )
 
-        # Create processing marker
         # Create processing marker
         with open(f"static/podcasts/{podcast_id}.processing", 'w') as f:
             f.write("processing")
 
-        # Add job to background tasks
-        background_tasks.add_task(
-            generate_podcast,
+        # Queue the generation job
+        await schedule_podcast_generation(
+            background_tasks,
             podcast_id=podcast_id,
             topics=podcast_data.topics,
             duration=podcast_data.duration,
@@ -79,7 +206,7 @@ async def create_podcast(
             language=podcast_data.language,
             user_id=podcast_data.user_id
         )
-        return PodcastResponse(
+        return PodcastResponse.construct(
             podcast_id=podcast_id,
             status="processing",
             topics=podcast_data.topics,
@@ -96,6 +223,130 @@ async def create_podcast(
             detail=str(e)
         )
 
+@router.post("/podcasts/batch", response_model=List[PodcastResponse], status_code=202)
+async def create_podcasts_batch(
+    podcasts_data: List[PodcastCreate],
+    background_tasks: BackgroundTasks
+):
+    """Create several podcasts at once, inserting all of their records in one Supabase request."""
+    try:
+        if not podcasts_data:
+            raise HTTPException(
+                status_code=400,
+                detail="At least one podcast is required"
+            )
+
+        # Validate every voice against the cached voice list
+        available_voice_ids = _load_voices().voice_ids
+        for podcast_data in podcasts_data:
+            for voice_id in (podcast_data.host_voice, podcast_data.co_host_voice):
+                if voice_id not in available_voice_ids:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"Invalid voice ID: {voice_id}"
+                    )
+
+        podcast_ids = [str(uuid.uuid4()) for _ in podcasts_data]
+        await insert_podcasts_into_supabase([
+            _podcast_row(
+                podcast_id=podcast_id,
+                user_id=podcast_data.user_id,
+                topics=podcast_data.topics,
+                duration=podcast_data.duration,
+                host_voice=podcast_data.host_voice,
+                co_host_voice=podcast_data.co_host_voice,
+                language=podcast_data.language
+            )
+            for podcast_id, podcast_data in zip(podcast_ids, podcasts_data)
+        ])
+
+        responses = []
+        for podcast_id, podcast_data in zip(podcast_ids, podcasts_data):
+            # Create processing marker
+            with open(f"static/podcasts/{podcast_id}.processing", 'w') as f:
+                f.write("processing")
+
+            await schedule_podcast_generation(
+                background_tasks,
+                podcast_id=podcast_id,
+                topics=podcast_data.topics,
+                duration=podcast_data.duration,
+                host_voice=podcast_data.host_voice,
+                co_host_voice=podcast_data.co_host_voice,
+                language=podcast_data.language,
+                user_id=podcast_data.user_id
+            )
+            responses.append(PodcastResponse.construct(
+                podcast_id=podcast_id,
+                status="processing",
+                topics=podcast_data.topics,
+                message="Your podcast is being generated. Check status endpoint for updates."
+            ))
+        return responses
+
+    except HTTPException as e:
+        logger.error(f"HTTP error creating podcasts: {str(e)}")
+        raise
+    except Exception as e:
+        logger.error(f"Error creating podcasts: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=str(e)
+        )
+
+_arq_pool = None
+# After a failed connection or enqueue, podcasts skip the task queue until this
+# time.monotonic() value, so each request doesn't wait on Redis' connection retries
+_arq_unavailable_until = 0.0
+ARQ_RETRY_AFTER = 60.0
+# Created on first use so it belongs to the server's event loop
+_arq_pool_lock: Optional[asyncio.Lock] = None
+
+async def get_arq_pool():
+    """Return the shared ARQ Redis pool, or None when no task queue is configured."""
+    global _arq_pool, _arq_pool_lock
+    redis_url = get_settings().redis_url
+    if not arq_available or not redis_url:
+        return None
+    if _arq_pool is not None:
+        return _arq_pool
+    
+    if _arq_pool_lock is None:
+        _arq_pool_lock = asyncio.Lock()
+    # Concurrent first requests wait for one pool instead of each creating their own
+    async with _arq_pool_lock:
+        if _arq_pool is None:
+            _arq_pool = await create_pool(RedisSettings.from_dsn(redis_url))
+    return _arq_pool
+
+@router.on_event("shutdown")
+async def close_arq_pool():
+    """Close the ARQ Redis pool on shutdown, if one was created."""
+    global _arq_pool
+    if _arq_pool is not None:
+        await _arq_pool.aclose()
+        _arq_pool = None
+
+async def schedule_podcast_generation(background_tasks: BackgroundTasks, **job):
+    """
+    Queue generate_podcast on the ARQ worker (see worker.py) when REDIS_URL is set,
+    otherwise run it as an in-process FastAPI background task.
+    If Redis can't be reached, the podcast is generated in-process instead and the queue
+    is not tried again for ARQ_RETRY_AFTER seconds.
+    """
+    global _arq_unavailable_until
+    if time.monotonic() >= _arq_unavailable_until:
+        try:
+            pool = await get_arq_pool()
+            if pool is not None:
+                await pool.enqueue_job("generate_podcast_job", **job)
+                logger.info(f"Queued podcast {job['podcast_id']} on the task queue")
+                return
+        except Exception as e:
+            _arq_unavailable_until = time.monotonic() + ARQ_RETRY_AFTER
+            logger.error(f"Task queue unavailable, generating podcast {job['podcast_id']} in-process: {str(e)}")
+    background_tasks.add_task(generate_podcast, **job)
+
 async def insert_podcast_into_supabase(
     user_id: str,
     podcast_id: str,
@@ -106,60 +357,65 @@ async def insert_podcast_into_supabase(
     language: str
 ):
     """Inserts podcast data into Supabase."""
-    # Get environment variables using os.getenv
-    supabase_url = os.getenv("VITE_SUPABASE_URL")
-    # Try both possible environment variable names for the service role key
-    supabase_service_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
-    
-    # Log keys for debugging (mask part of the key)
-    if supabase_service_key:
-        masked_key = supabase_service_key[:10] + "..." + supabase_service_key[-5:] if len(supabase_service_key) > 15 else "***masked***"
-        logger.info(f"Using service role key: {masked_key}")
-    else:
-        logger.error("SUPABASE_SERVICE_ROLE_KEY is not set in environment variables")
-    
-    if not supabase_url:
-        logger.error("VITE_SUPABASE_URL is not set in environment variables")
-    
-    if not supabase_url or not supabase_service_key:
+    return await insert_podcasts_into_supabase([_podcast_row(
+        podcast_id=podcast_id,
+        user_id=user_id,
+        topics=topics,
+        duration=duration,
+        host_voice=host_voice,
+        co_host_voice=co_host_voice,
+        language=language
+    )])
+
+def _podcast_row(
+    podcast_id: str,
+    user_id: str,
+    topics: List[str],
+    duration: int,
+    host_voice: str,
+    co_host_voice: str,
+    language: str
+) -> dict:
+    """Build the podcasts table row for a newly created podcast."""
+    return {
+        "id": podcast_id,
+        "user_id": user_id,
+        "topics": topics,
+        "duration": duration,
+        "host_voice": host_voice,
+        "co_host_voice": co_host_voice,
+        "language": language,
+        "status": "processing",
+    }
+
+async def insert_podcasts_into_supabase(rows: List[dict]):
+    """Inserts one or more podcast rows into Supabase with a single request."""
+    supabase = get_supabase()
+    if supabase is None:
         logger.error("Supabase URL or Service Role Key not configured")
         raise HTTPException(
             status_code=500,
             detail="Supabase URL or Service Role Key not configured"
         )
     
-    from supabase import create_client, Client
-    
-    # Use the service role key instead of anon key to bypass RLS
-    supabase: Client = create_client(supabase_url, supabase_service_key)
-    
     try:
         # Ensure we're using the correct user ID format
-        logger.info(f"Inserting podcast {podcast_id} for user {user_id} into Supabase")
+        for row in rows:
+            logger.info(f"Inserting podcast {row['id']} for user {row['user_id']} into Supabase")
         
         # Make sure user_id isn't null
-        if not user_id:
+        if not all(row["user_id"] for row in rows):
             logger.error("User ID is missing or null")
             raise HTTPException(
                 status_code=400,
                 detail="User ID is required"
             )
         
-        # Remove the await - the supabase client doesn't support it directly
-        response = supabase.table("podcasts").insert(
-            {
-                "id": podcast_id,
-                "user_id": user_id,
-                "topics": topics,
-                "duration": duration,
-                "host_voice": host_voice,
-                "co_host_voice": co_host_voice,
-                "language": language,
-                "status": "processing",
-            }
-        ).execute()
-        
-        # Now handle the response without await
+        # The supabase client is synchronous, so run the request in a worker thread
+        # to keep the event loop free
+        response = await asyncio.to_thread(supabase.table("podcasts").insert(rows).execute)
+        
+        # Now handle the response
         if hasattr(response, 'error') and response.error:
             logger.error(f"Error inserting podcast into Supabase: {response.error}")
             raise HTTPException(
@@ -173,14 +429,10 @@ async def insert_podcast_into_supabase(
         else:
             data = response
             
-        logger.info(f"Successfully inserted podcast {podcast_id} into Supabase with user_id {user_id}")
+        logger.info(f"Successfully inserted {len(rows)} podcast(s) into Supabase")
         
-        # Verify the insert by checking if the record exists
-        verify = supabase.table("podcasts").select("*").eq("id", podcast_id).execute()
-        if hasattr(verify, 'data') and verify.data:
-            logger.info(f"Verified podcast record: {verify.data}")
-        else:
-            logger.warning(f"Could not verify podcast record was created. Response: {verify}")
+        # The insert response already carries the new rows
+        logger.debug(f"Inserted podcast records: {data}")
         
         return data
     except Exception as e:
@@ -190,20 +442,32 @@ async def insert_podcast_into_supabase(
             detail=f"Failed to insert podcast into Supabase: {str(e)}"
         )
 
+def _stat_or_none(path: str) -> Optional[os.stat_result]:
+    """Stat a file once, returning None if it does not exist."""
+    try:
+        return os.stat(path)
+    except FileNotFoundError:
+        return None
+
+def _load_podcast_metadata(metadata_file: str) -> Tuple[dict, str]:
+    """Load (metadata, transcript) from a podcast's JSON file, or empty values if it is missing."""
+    try:
+        with open(metadata_file, 'rb') as f:
+            data = orjson.loads(f.read())
+    except FileNotFoundError:
+        return {}, ""
+    return data.get("metadata", {}), data.get("transcript", "")
+
 @router.get("/podcasts/{podcast_id}", response_model=PodcastResponse)
 async def get_podcast(podcast_id: str = Path(...)):
     """Get details of a specific podcast including status, metadata, transcript and download URL if ready."""
     try:
         # Check Supabase first for the podcast record
-        supabase_url = os.getenv("VITE_SUPABASE_URL")
-        supabase_service_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+        supabase = get_supabase()
         
-        if supabase_url and supabase_service_key:
-            from supabase import create_client, Client
-            supabase: Client = create_client(supabase_url, supabase_service_key)
-            
+        if supabase is not None:
             # Query for the podcast in Supabase
-            result = supabase.table("podcasts").select('*').eq("id", podcast_id).execute()
+            result = await asyncio.to_thread(supabase.table("podcasts").select('*').eq("id", podcast_id).execute)
             if hasattr(result, 'data') and result.data and len(result.data) > 0:
                 podcast_data = result.data[0]
                 
@@ -215,22 +479,16 @@ async def get_podcast(podcast_id: str = Path(...)):
                     podcast_file = f"static/podcasts/{podcast_id}.mp3"
                     metadata_file = f"static/podcasts/{podcast_id}.json"
                     
-                    if os.path.exists(podcast_file):
-                        metadata = {}
-                        transcript = ""
-                        
+                    podcast_stat = _stat_or_none(podcast_file)
+                    if podcast_stat is not None:
                         # Load metadata and transcript if available
-                        if os.path.exists(metadata_file):
-                            with open(metadata_file, 'r') as f:
-                                data = json.load(f)
-                                metadata = data.get("metadata", {})
-                                transcript = data.get("transcript", "")
+                        metadata, transcript = _load_podcast_metadata(metadata_file)
                         
-                        return PodcastResponse(
+                        return PodcastResponse.construct(
                             podcast_id=podcast_id,
                             status="completed",
                             url=f"/static/podcasts/{podcast_id}.mp3",
-                            created_at=datetime.fromtimestamp(os.path.getctime(podcast_file)) if os.path.exists(podcast_file) else datetime.now(),
+                            created_at=datetime.fromtimestamp(podcast_stat.st_ctime),
                             duration=podcast_data.get('duration', 300),
                             metadata=metadata,
                             transcript=transcript,
@@ -239,7 +497,7 @@ async def get_podcast(podcast_id: str = Path(...)):
                     else:
                         # File doesn't exist but database says completed - this is an error state
                         logger.warning(f"Podcast {podcast_id} is marked completed in database but file not found")
-                        return PodcastResponse(
+                        return PodcastResponse.construct(
                             podcast_id=podcast_id,
                             status="failed",
                             message="Podcast file not found though marked as completed. Please contact support.",
@@ -247,7 +505,7 @@ async def get_podcast(podcast_id: str = Path(...)):
                         )
                 
                 # For processing or failed podcasts, return the status from the database
-                return PodcastResponse(
+                return PodcastResponse.construct(
                     podcast_id=podcast_id,
                     status=podcast_data.get('status', 'processing'),
                     message=podcast_data.get('message', 'Your podcast is being processed.'),
@@ -262,22 +520,16 @@ async def get_podcast(podcast_id: str = Path(...)):
         processing_file = f"static/podcasts/{podcast_id}.processing"
         
         # Check if the podcast is completed (file exists)
-        if os.path.exists(podcast_file):
-            metadata = {}
-            transcript = ""
-            
+        podcast_stat = _stat_or_none(podcast_file)
+        if podcast_stat is not None:
             # Load metadata and transcript if available
-            if os.path.exists(metadata_file):
-                with open(metadata_file, 'r') as f:
-                    data = json.load(f)
-                    metadata = data.get("metadata", {})
-                    transcript = data.get("transcript", "")
+            metadata, transcript = _load_podcast_metadata(metadata_file)
             
-            return PodcastResponse(
+            return PodcastResponse.construct(
                 podcast_id=podcast_id,
                 status="completed",
                 url=f"/static/podcasts/{podcast_id}.mp3",
-                created_at=datetime.fromtimestamp(os.path.getctime(podcast_file)),
+                created_at=datetime.fromtimestamp(podcast_stat.st_ctime),
                 duration=300,  # Would be calculated from actual file
                 metadata=metadata,
                 transcript=transcript
@@ -285,7 +537,7 @@ async def get_podcast(podcast_id: str = Path(...)):
         
         # Check if podcast is still processing
         if os.path.exists(processing_file):
-            return PodcastResponse(
+            return PodcastResponse.construct(
                 podcast_id=podcast_id,
                 status="processing",
                 message="Your podcast is still being generated.",
@@ -315,22 +567,47 @@ async def list_podcasts(
 ):
     """List all podcasts with pagination."""
     try:
+        supabase = get_supabase()
+        
+        if supabase is not None:
+            # Let the database sort and paginate so only the requested page is fetched
+            result = await asyncio.to_thread(
+                supabase.table("podcasts")
+                .select("id, status, url, topics, created_at, duration, message")
+                .order("created_at", desc=True)
+                .range(skip, skip + limit - 1)
+                .execute
+            )
+            # created_at is passed through as the ISO string from Supabase; the
+            # response_model validation parses it into a datetime
+            return [PodcastResponse.construct(
+                podcast_id=row["id"],
+                status=row.get("status", "processing"),
+                url=row.get("url"),
+                message=row.get("message"),
+                created_at=row.get("created_at"),
+                duration=row.get("duration", 300),
+                topics=row.get("topics") or []
+            ) for row in result.data or []]
+        
+        # Fallback to the local files when Supabase is not configured
         podcasts = []
         podcast_dir = "static/podcasts"
         
         if os.path.exists(podcast_dir):
-            files = [f for f in os.listdir(podcast_dir) if f.endswith('.mp3')]
-            files.sort(key=lambda x: os.path.getctime(os.path.join(podcast_dir, x)), reverse=True)
+            # One scandir pass; DirEntry.stat() is reused for both sorting and created_at
+            with os.scandir(podcast_dir) as it:
+                entries = [(entry.name, entry.stat().st_ctime) for entry in it if entry.name.endswith('.mp3')]
+            entries.sort(key=lambda entry: entry[1], reverse=True)
             
-            for file in files[skip:skip+limit]:
+            for file, ctime in entries[skip:skip+limit]:
                 podcast_id = file.replace('.mp3', '')
-                file_path = os.path.join(podcast_dir, file)
                 
-                podcasts.append(PodcastResponse(
+                podcasts.append(PodcastResponse.construct(
                     podcast_id=podcast_id,
                     status="completed",
                     url=f"/static/podcasts/{file}",
-                    created_at=datetime.fromtimestamp(os.path.getctime(file_path)),
+                    created_at=datetime.fromtimestamp(ctime),
                     duration=300,  # Would be calculated from actual file
                     topics=[]  # Would be retrieved from database in production
                 ))
@@ -345,12 +622,11 @@ async def list_podcasts(
         )
 
 @router.get("/health", response_model=HealthCheck, tags=["system"])
-async def check_health():
+async def check_health(settings: Settings = Depends(get_settings)):
     """Check the health status of the API."""
     try:
-        # Read version from package or environment variable, defaulting to 1.0.0
-        version = os.getenv("API_VERSION", "1.0.0")
-        return HealthCheck(status="healthy", version=version)
+        # Version comes from the API_VERSION environment variable, defaulting to 1.0.0
+        return HealthCheck(status="healthy", version=settings.api_version)
     except Exception as e:
         logger.error(f"Health check failed: {str(e)}")
         raise HTTPException(
@@ -358,21 +634,17 @@ async def check_health():
             detail="System health check failed"
         )
 
-@router.get("/voices", response_model=List[dict], tags=["voices"])
+@router.get("/voices", response_model=List[Voice], tags=["voices"])
 async def list_voices():
     """Get list of available ElevenLabs voices with details."""
     try:
-        audio_processor = AudioProcessor()
-        voices = audio_processor.get_available_voices()
-        # Include more details in response
-        return [{
-            "voice_id": voice["voice_id"],
-            "name": voice["name"],
-            "category": voice["category"],
-            "labels": voice.get("labels", {}),
-            # No longer need to construct sample_url here, frontend will use the new proxy endpoint
-            # "sample_url": f"https://api.elevenlabs.io/v1/voices/{voice['voice_id']}/preview"
-        } for voice in voices]
+        # Include more details in response. The list comes straight from ElevenLabs, so the
+        # cached orjson body is returned as-is instead of going through response_model.
+        return Response(
+            content=get_cached_voices_json(),
+            media_type="application/json",
+            headers={"Cache-Control": f"public, max-age={VOICES_CACHE_TTL}"}
+        )
     except Exception as e:
         logger.error(f"Error listing voices: {str(e)}") # Changed log message slightly
         raise HTTPException(
@@ -381,9 +653,9 @@ async def list_voices():
         )
 
 @router.get("/voices/{voice_id}/preview", tags=["voices"])
-async def get_voice_preview(voice_id: str = Path(...)):
+async def get_voice_preview(voice_id: str = Path(...), settings: Settings = Depends(get_settings)):
     """Proxy endpoint to fetch and stream voice preview audio from ElevenLabs."""
-    api_key = os.getenv("ELEVENLABS_API_KEY") or os.getenv("ELEVEN_API_KEY")
+    api_key = settings.elevenlabs_api_key
     if not api_key:
         logger.error("Cannot fetch voice preview: ElevenLabs API key is not configured.")
         raise HTTPException(status_code=500, detail="API key not configured for voice previews")
@@ -391,29 +663,42 @@ async def get_voice_preview(voice_id: str = Path(...)):
     eleven_url = f"https://api.elevenlabs.io/v1/voices/{voice_id}/preview"
     headers = {"xi-api-key": api_key}
 
+    cached_preview = _preview_cache.get(voice_id)
+    if cached_preview is not None:
+        content, content_type = cached_preview
+        return Response(content=content, media_type=content_type, headers=PREVIEW_CACHE_HEADERS)
+
     try:
         logger.info(f"Proxying request for voice preview: {voice_id} to {eleven_url}")
-        # Use stream=True to handle potentially large audio files efficiently
-        response = requests.get(eleven_url, headers=headers, stream=True, timeout=20) # Added timeout
+        # Stream the upstream body without blocking the event loop
+        request = _elevenlabs_client.build_request("GET", eleven_url, headers=headers)
+        response = await _elevenlabs_client.send(request, stream=True)
 
         if response.status_code == 200:
             # Check content type, default to audio/mpeg if not provided
             content_type = response.headers.get("Content-Type", "audio/mpeg")
             logger.info(f"ElevenLabs response headers: {response.headers}") # Added detailed header logging
             logger.info(f"Successfully fetched preview from ElevenLabs (Status: 200, Type: {content_type})")
-            # Stream the response back to the client
-            return StreamingResponse(response.iter_content(chunk_size=1024*4), media_type=content_type)
+            # Stream the response back to the client in large chunks, keeping a copy for the cache
+            return StreamingResponse(
+                _stream_and_cache_preview(voice_id, response, content_type),
+                media_type=content_type,
+                headers=PREVIEW_CACHE_HEADERS
+            )
         else:
-            error_detail = response.text # Read the error text
+            error_detail = (await response.aread()).decode(errors="replace") # Read the error text
+            await response.aclose()
             logger.error(f"Failed to fetch preview from ElevenLabs (Status: {response.status_code}): {error_detail}")
             raise HTTPException(
                 status_code=response.status_code,
                 detail=f"Error from ElevenLabs API: {error_detail}"
             )
-    except requests.exceptions.Timeout:
+    except HTTPException:
+        raise
+    except httpx.TimeoutException:
         logger.error(f"Timeout fetching voice preview from ElevenLabs: {eleven_url}")
         raise HTTPException(status_code=504, detail="Timeout fetching preview from upstream service")
-    except requests.exceptions.RequestException as e:
+    except httpx.RequestError as e:
         logger.error(f"Network error fetching voice preview from ElevenLabs: {str(e)}")
         raise HTTPException(status_code=502, detail=f"Network error fetching preview: {str(e)}")
     except Exception as e:
@@ -421,6 +706,18 @@ async def get_voice_preview(voice_id: str = Path(...)):
         raise HTTPException(status_code=500, detail=f"Internal server error fetching preview: {str(e)}")
 
 
+async def _stream_and_cache_preview(voice_id: str, response: httpx.Response, content_type: str):
+    """Relay an upstream preview body and cache it once it has been read completely."""
+    buffer = bytearray()
+    try:
+        async for chunk in response.aiter_bytes(chunk_size=PREVIEW_CHUNK_SIZE):
+            buffer.extend(chunk)
+            yield chunk
+        _preview_cache[voice_id] = (bytes(buffer), content_type)
+    finally:
+        await response.aclose()
+
+
 async def generate_podcast(
     podcast_id: str,
     topics: List[str],
@@ -433,24 +730,9 @@ async def generate_podcast(
     """Background task for podcast generation."""
     try:
         # Initialize components
-        audio_processor = AudioProcessor()
-        news_collector = NewsCollector()
-        content_processor = ContentProcessor()
-        
-        # Create processing marker
-        with open(f"static/podcasts/{podcast_id}.processing", 'w') as f:
-            f.write("processing")
-        
-        # Collect news and process content
-        articles = news_collector.collect_news(topics, days_back=1)
-        podcast_script = content_processor.process_content(articles, duration)
-        
-        # Save metadata and transcript
-        with open(f"static/podcasts/{podcast_id}.json", 'w') as f:
-            json.dump({
-                "metadata": podcast_script["metadata"],
-                "transcript": podcast_script["transcript"]
-            }, f, default=str)
+        audio_processor = get_audio_processor()
+        news_collector = get_news_collector()
+        content_processor = get_content_processor()
         
         # Create chatbots
         host = ChatBot("Alex", "Professional and engaging tech podcast host",
@@ -458,9 +740,35 @@ async def generate_podcast(
         co_host = ChatBot("Sarah", "Knowledgeable and enthusiastic tech expert",
                          "Engage in natural conversation", co_host_voice)
         
+        async def build_script() -> dict:
+            articles = await news_collector.collect_news_async(topics, days_back=1)
+            return await asyncio.to_thread(content_processor.process_content, articles, duration)
+        
+        # The intro and outro lines don't depend on the news, so synthesize them while
+        # the news is collected and the script is written
+        logger.info("Starting audio generation...")
+        (intro_host, intro_cohost, outro_host, outro_cohost), podcast_script = await asyncio.gather(
+            asyncio.gather(
+                asyncio.to_thread(host.speak, INTRO_HOST_LINE, True),
+                asyncio.to_thread(co_host.speak, INTRO_COHOST_LINE, True),
+                asyncio.to_thread(host.speak, OUTRO_HOST_LINE, True),
+                asyncio.to_thread(co_host.speak, OUTRO_COHOST_LINE, True),
+            ),
+            build_script(),
+        )
+        
+        # Save metadata and transcript; write to a temp file and rename so readers
+        # never see a partially written JSON file
+        metadata_file = f"static/podcasts/{podcast_id}.json"
+        with open(f"{metadata_file}.tmp", 'wb', buffering=1 << 16) as f:
+            f.write(orjson.dumps({
+                "metadata": podcast_script["metadata"],
+                "transcript": podcast_script["transcript"]
+            }, default=str, option=orjson.OPT_NON_STR_KEYS))
+        os.replace(f"{metadata_file}.tmp", metadata_file)
+        
         # Initialize audio segments list
         segments = []
-        logger.info("Starting audio generation...")
 
         # 1. Add intro music
         # intro_music = audio_processor.get_intro_music()
@@ -469,12 +777,10 @@ async def generate_podcast(
         #     logger.info("Added intro music")
         
         # 2. Add intro dialogue
-        intro_host = host.speak("Hello and welcome to TechTalk, your source for the latest in technology! I'm Alex, and with me today is Sarah.")
         if intro_host:
             segments.append(intro_host)
             logger.info("Added host intro")
         
-        intro_cohost = co_host.speak("Hi everyone! We've got some fascinating stories to discuss today.")
         if intro_cohost:
             segments.append(intro_cohost)
             logger.info("Added co-host intro")
@@ -485,52 +791,36 @@ async def generate_podcast(
         #     segments.append(transition)
         
         # 3. Process main content
-        last_speaker = None
+        # Collect the lines first, then synthesize them concurrently and splice the
+        # audio back in script order
+        lines_to_speak = []
         last_line = ""
         
         for segment in podcast_script["segments"]:
-            lines = segment["content"].split('\n')
-            segment_segments = []
-            
-            for line in lines:
-                if not line.strip() or ':' not in line:
-                    continue
-                
-                speaker, text = line.split(':', 1)
-                text = text.strip()
-                
+            for speaker, text in LINE_RE.findall(segment["content"]):
                 # Skip if too similar to last line
                 if text == last_line:
                     continue
                 
-                try:
-                    if speaker == "Alex":
-                        audio = host.speak(text)
-                    else:
-                        audio = co_host.speak(text)
-                        
-                    if audio:
-                        segment_segments.append(audio)
-                        last_speaker = speaker
-                        last_line = text
-                        logger.info(f"Added {speaker}'s line")
-                except Exception as e:
-                    logger.error(f"Error generating audio for {speaker}: {str(e)}")
-            
-            # Add segment audio
-            segments.extend(segment_segments)
-            
-            # Add transition between segments if not the last segment
-            # if transition and segment != podcast_script["segments"][-1]:
-            #     segments.append(transition)
+                lines_to_speak.append((speaker, text))
+                last_line = text
+        
+        # convert_many bounds the requests in flight and falls back to mock audio per line
+        line_audio = await asyncio.to_thread(
+            audio_processor.convert_many,
+            [(text, host.voice if speaker == "Alex" else co_host.voice) for speaker, text in lines_to_speak],
+            True
+        )
+        for (speaker, _), audio in zip(lines_to_speak, line_audio):
+            if audio:
+                segments.append(audio)
+                logger.info(f"Added {speaker}'s line")
         
         # 4. Add outro dialogue
-        outro_host = host.speak("And that wraps up our tech roundup for today. Thanks for joining us!")
         if outro_host:
             segments.append(outro_host)
             logger.info("Added host outro")
         
-        outro_cohost = co_host.speak("Don't forget to subscribe and leave us a review. See you next time!")
         if outro_cohost:
             segments.append(outro_cohost)
             logger.info("Added co-host outro")
@@ -585,19 +875,11 @@ async def update_podcast_status_in_supabase(
     message: Optional[str] = None
 ):
     """Updates podcast status and data in Supabase."""
-    # Get environment variables using os.getenv
-    supabase_url = os.getenv("VITE_SUPABASE_URL")
-    supabase_service_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
-    
-    if not supabase_url or not supabase_service_key:
+    supabase = get_supabase()
+    if supabase is None:
         logger.error("Supabase URL or Service Role Key not configured")
         return False
     
-    from supabase import create_client, Client
-    
-    # Use the service role key to bypass RLS
-    supabase: Client = create_client(supabase_url, supabase_service_key)
-    
     try:
         logger.info(f"Updating podcast {podcast_id} status to {status}")
         
@@ -617,7 +899,7 @@ async def update_podcast_status_in_supabase(
         if message:
             update_data["message"] = message
         
-        response = supabase.table("podcasts").update(update_data).eq("id", podcast_id).execute()
+        response = await asyncio.to_thread(supabase.table("podcasts").update(update_data).eq("id", podcast_id).execute)
         
         if hasattr(response, 'error') and response.error:
             logger.error(f"Error updating podcast in Supabase: {response.error}")
@@ -632,42 +914,20 @@ async def update_podcast_status_in_supabase(
 
 async def list_podcasts_by_user(user_id: str):
     """Debug function to list all podcasts in Supabase for a specific user."""
-    # Get environment variables using os.getenv
-    supabase_url = os.getenv("VITE_SUPABASE_URL")
-    supabase_service_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
-    
-    if not supabase_url or not supabase_service_key:
+    supabase = get_supabase()
+    if supabase is None:
         logger.error("Supabase URL or Service Role Key not configured")
         return None
     
-    from supabase import create_client, Client
-    
-    # Use the service role key to bypass RLS
-    supabase: Client = create_client(supabase_url, supabase_service_key)
-    
     try:
-        logger.info(f"Querying all podcasts in database for user {user_id}")
+        logger.info(f"Querying podcasts in database for user {user_id}")
         
-        # Query all podcasts to see what's actually in the database
-        all_podcasts = supabase.table("podcasts").select('*').execute()
+        # Filter by user on the server so only this user's rows are returned
+        user_podcasts = await asyncio.to_thread(supabase.table("podcasts").select('*').eq("user_id", user_id).execute)
         
-        if hasattr(all_podcasts, 'data'):
-            logger.info(f"Total podcasts in database: {len(all_podcasts.data)}")
-            
-            # Log all user_ids in the database to check for mismatches
-            user_ids = set([podcast.get('user_id') for podcast in all_podcasts.data if podcast.get('user_id')])
-            logger.info(f"Unique user_ids in database: {user_ids}")
-            
-            if user_id in user_ids:
-                logger.info(f"User {user_id} found in database")
-            else:
-                logger.info(f"User {user_id} NOT found in database")
-            
-            # Find podcasts for this specific user
-            user_podcasts = [p for p in all_podcasts.data if p.get('user_id') == user_id]
-            logger.info(f"Found {len(user_podcasts)} podcasts for user {user_id}")
-            
-            return user_podcasts
+        if hasattr(user_podcasts, 'data'):
+            logger.info(f"Found {len(user_podcasts.data)} podcasts for user {user_id}")
+            return user_podcasts.data or []
         else:
             logger.warning("No data returned from Supabase query")
             return []
@@ -688,11 +948,8 @@ async def debug_list_user_podcasts(user_id: str = Path(...)):
         local_files = []
         
         if os.path.exists(podcast_dir):
-            files = [f for f in os.listdir(podcast_dir) if f.endswith('.mp3')]
-            
-            for file in files:
-                podcast_id = file.replace('.mp3', '')
-                local_files.append(podcast_id)
+            with os.scandir(podcast_dir) as it:
+                local_files = [entry.name.replace('.mp3', '') for entry in it if entry.name.endswith('.mp3')]
         
         # Return both database records and local files
         return {
@@ -0,0 +1,17 @@
+from functools import lru_cache
+from typing import Optional
+from pydantic import BaseSettings, Field
+
+class Settings(BaseSettings):
+    """Environment configuration used by the API routes, read once per process."""
+    supabase_url: Optional[str] = Field(None, env="VITE_SUPABASE_URL")
+    supabase_service_role_key: Optional[str] = Field(None, env="SUPABASE_SERVICE_ROLE_KEY")
+    # Either name is accepted, matching AudioProcessor
+    elevenlabs_api_key: Optional[str] = Field(None, env=["ELEVENLABS_API_KEY", "ELEVEN_API_KEY"])
+    redis_url: Optional[str] = Field(None, env="REDIS_URL")
+    api_version: str = Field("1.0.0", env="API_VERSION")
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide settings; use as a FastAPI dependency."""
+    return Settings()
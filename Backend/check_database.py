@@ -1,6 +1,9 @@
 import os
 import logging
-from supabase import create_client, Client
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from supabase import Client
+from src.supabase_client import get_supabase
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -23,12 +26,19 @@ def check_database_podcasts():
     print(f"Connecting to Supabase URL: {supabase_url}")
     
     # Initialize Supabase client with service key to bypass RLS
-    supabase = create_client(supabase_url, supabase_service_key)
+    supabase = get_supabase()
     
     try:
-        # Get all podcasts
+        # Get all podcasts and, concurrently, run the frontend test query below
         print("Querying podcasts table...")
-        response = supabase.table("podcasts").select("id, user_id, status, url").execute()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            podcasts_future = executor.submit(supabase.table("podcasts").select("id, user_id, status, url").execute)
+            frontend_future = executor.submit(
+                # Only the number of matching rows is reported, so ask for the count without the rows
+                supabase.table("podcasts").select("id", count="exact", head=True).eq("user_id", "user_2wNeXyyGo1hYZZuoZ2QlV7yZwbO").execute
+            )
+            response = podcasts_future.result()
+            frontend_response = frontend_future.result()
         
         if not response.data:
             print("No podcast records found in the database")
@@ -38,41 +48,31 @@ def check_database_podcasts():
         podcasts = response.data
         print(f"Found {len(podcasts)} podcasts in the database")
         
-        # Print each podcast ID, user ID, and status
+        # Print each podcast ID, user ID, and status, counting by user_id and status in the same pass
+        user_counts = Counter()
+        status_counts = Counter()
         print("\nPodcast details:")
         for podcast in podcasts:
             print(f"ID: {podcast.get('id')}, User: {podcast.get('user_id')}, Status: {podcast.get('status')}, URL: {podcast.get('url', 'None')}")
+            if podcast.get('user_id'):
+                user_counts[podcast['user_id']] += 1
+            if podcast.get('status'):
+                status_counts[podcast['status']] += 1
+        user_counts = dict(user_counts)
+        status_counts = dict(status_counts)
         
         # Get unique user IDs
-        user_ids = set(podcast.get('user_id') for podcast in podcasts if podcast.get('user_id'))
+        user_ids = set(user_counts)
         print(f"\nUnique user IDs: {user_ids}")
-        
-        # Count by user_id
-        user_counts = {}
-        for podcast in podcasts:
-            user_id = podcast.get('user_id')
-            if user_id:
-                user_counts[user_id] = user_counts.get(user_id, 0) + 1
-                
         print(f"Podcast counts by user: {user_counts}")
-        
-        # Count by status
-        status_counts = {}
-        for podcast in podcasts:
-            status = podcast.get('status')
-            if status:
-                status_counts[status] = status_counts.get(status, 0) + 1
-                
         print(f"Podcast counts by status: {status_counts}")
         
         # Now test querying as if we were the frontend
         print("\nTesting frontend query for user_id=user_2wNeXyyGo1hYZZuoZ2QlV7yZwbO...")
-        frontend_response = supabase.table("podcasts").select("*").eq("user_id", "user_2wNeXyyGo1hYZZuoZ2QlV7yZwbO").execute()
-        
-        if not frontend_response.data:
+        if not frontend_response.count:
             print("Frontend query returned NO results - this confirms the RLS policy issue")
         else:
-            print(f"Frontend query returned {len(frontend_response.data)} podcasts")
+            print(f"Frontend query returned {frontend_response.count} podcasts")
             
         return {
             "podcasts": podcasts,
@@ -2,11 +2,16 @@ import os
 import sys
 import requests
 import logging
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("supabase-rls-fix")
 
+# Number of SQL statements sent per exec_sql call
+STATEMENT_BATCH_SIZE = 50
+
 def apply_rls_fixes():
     """
     Apply RLS policy fixes to Supabase database
@@ -40,39 +45,77 @@ def apply_rls_fixes():
         "Prefer": "params=single-object"
     }
     
+    # Reuse one connection for every statement. Only rate-limit / unavailable responses are
+    # retried: the statement was not run, so re-sending it is safe
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(max_retries=Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 503],
+        allowed_methods=frozenset(["POST"])
+    )))
+    
+    # Skip comment lines and blank lines, keeping each statement's position for logging
+    numbered_statements = [
+        (i, statement) for i, statement in enumerate(sql_statements, 1)
+        if statement.strip() and not statement.strip().startswith('--')
+    ]
+    
     success_count = 0
     error_count = 0
     
-    # Execute each statement
-    for i, statement in enumerate(sql_statements, 1):
-        # Skip comment lines and blank lines
-        if statement.strip().startswith('--') or not statement.strip():
-            continue
-            
-        logger.info(f"Executing statement {i}: {statement[:60]}...")
+    # Send the statements STATEMENT_BATCH_SIZE at a time in one exec_sql call. Each RPC runs in
+    # a single transaction, so a failing batch changes nothing and is retried one statement at
+    # a time to report exactly which statements fail.
+    for start in range(0, len(numbered_statements), STATEMENT_BATCH_SIZE):
+        batch = numbered_statements[start:start + STATEMENT_BATCH_SIZE]
+        first, last = batch[0][0], batch[-1][0]
+        logger.info(f"Executing statements {first}-{last}...")
         
         try:
-            # Format for the RPC call
-            payload = {
-                "query": statement
-            }
-            
-            response = requests.post(sql_endpoint, headers=headers, json=payload)
-            
+            response = session.post(sql_endpoint, headers=headers, json={
+                "query": ";\n".join(statement for _, statement in batch)
+            })
             if response.status_code == 200:
-                logger.info(f"Statement {i} executed successfully")
+                logger.info(f"Statements {first}-{last} executed successfully")
+                success_count += len(batch)
+                continue
+            logger.warning(f"Batch {first}-{last} failed ({response.status_code}), executing statements individually")
+        except Exception as e:
+            logger.warning(f"Exception executing batch {first}-{last}: {str(e)}, executing statements individually")
+        
+        for i, statement in batch:
+            if _execute_statement(session, sql_endpoint, headers, i, statement):
                 success_count += 1
             else:
-                logger.error(f"Error executing statement {i}: {response.status_code} {response.text}")
                 error_count += 1
-                
-        except Exception as e:
-            logger.error(f"Exception executing statement {i}: {str(e)}")
-            error_count += 1
     
+    session.close()
     logger.info(f"Execution complete. Success: {success_count}, Errors: {error_count}")
     return success_count > 0 and error_count == 0
 
+def _execute_statement(session: requests.Session, sql_endpoint: str, headers: dict, i: int, statement: str) -> bool:
+    """Execute a single SQL statement through exec_sql, returning whether it succeeded."""
+    logger.info(f"Executing statement {i}: {statement[:60]}...")
+    
+    try:
+        # Format for the RPC call
+        payload = {
+            "query": statement
+        }
+        
+        response = session.post(sql_endpoint, headers=headers, json=payload)
+        
+        if response.status_code == 200:
+            logger.info(f"Statement {i} executed successfully")
+            return True
+        logger.error(f"Error executing statement {i}: {response.status_code} {response.text}")
+        return False
+            
+    except Exception as e:
+        logger.error(f"Exception executing statement {i}: {str(e)}")
+        return False
+
 if __name__ == "__main__":
     print("Applying Supabase RLS fixes...")
     if apply_rls_fixes():
@@ -1,13 +1,36 @@
 import os
-import json
+import sys
 import logging
+import orjson
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from supabase import create_client, Client
+from supabase import Client
+
+# Add parent directory to path to import our modules when run as a script
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.supabase_client import get_supabase
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("sync-utility")
 
+# URL prefix the API serves podcast files under
+STATIC_PREFIX = "/static/podcasts/"
+
+# Number of podcast IDs per existence-check query
+ID_QUERY_BATCH_SIZE = 200
+
+# Number of threads reading podcast metadata files
+METADATA_READ_WORKERS = 16
+
+# Number of rows per bulk insert/upsert request
+WRITE_BATCH_SIZE = 500
+
+# NOT NULL columns of existing rows, carried into their upsert rows so that
+# the upsert can update them without supplying every column again
+EXISTING_COLUMNS = "id, user_id, duration, topics, host_voice, co_host_voice, language"
+
 def sync_podcasts_with_supabase():
     """
     Utility to sync locally generated podcasts with Supabase database.
@@ -24,7 +47,7 @@ def sync_podcasts_with_supabase():
         return {"error": "Supabase configuration is missing"}
     
     # Initialize Supabase client
-    supabase = create_client(supabase_url, supabase_service_key)
+    supabase = get_supabase()
     
     # Directory where podcasts are stored
     podcast_dir = "static/podcasts"
@@ -33,8 +56,12 @@ def sync_podcasts_with_supabase():
         logger.error(f"Podcast directory {podcast_dir} not found")
         return {"error": f"Podcast directory {podcast_dir} not found"}
     
-    # Find all MP3 files
-    mp3_files = [f for f in os.listdir(podcast_dir) if f.endswith('.mp3')]
+    # Find all MP3 files, noting which metadata files exist in the same directory scan
+    with os.scandir(podcast_dir) as entries:
+        file_names = [entry.name for entry in entries if entry.is_file(follow_symlinks=False)]
+    mp3_files = [f for f in file_names if f.endswith('.mp3')]
+    json_files = {f for f in file_names if f.endswith('.json')}
+    podcast_ids = [mp3_file[:-4] for mp3_file in mp3_files]
     logger.info(f"Found {len(mp3_files)} MP3 files in {podcast_dir}")
     
     # Track results
@@ -48,6 +75,14 @@ def sync_podcasts_with_supabase():
         "details": []
     }
     
+    # Start reading the metadata files in the background while Supabase is queried below
+    metadata_executor = ThreadPoolExecutor(max_workers=METADATA_READ_WORKERS)
+    metadata_futures = {
+        podcast_id: metadata_executor.submit(_load_metadata, os.path.join(podcast_dir, podcast_id + ".json"))
+        for podcast_id in podcast_ids
+        if podcast_id + ".json" in json_files
+    }
+    
     # Get the database schema to check what columns exist
     try:
         schema_response = supabase.table("podcasts").select("*").limit(1).execute()
@@ -59,14 +94,35 @@ def sync_podcasts_with_supabase():
     except Exception as e:
         logger.error(f"Error retrieving schema: {str(e)}")
     
-    # For each MP3 file, find the corresponding JSON and update/create the Supabase record
-    for mp3_file in mp3_files:
-        podcast_id = mp3_file.replace('.mp3', '')
-        json_file = f"{podcast_dir}/{podcast_id}.json"
+    # Look up which podcasts already exist with one IN query per batch instead of one query per file.
+    # Batches keep the request URL (36-character UUIDs) well under server limits.
+    existing_rows = {}
+    try:
+        for start in range(0, len(podcast_ids), ID_QUERY_BATCH_SIZE):
+            batch = podcast_ids[start:start + ID_QUERY_BATCH_SIZE]
+            response = supabase.table("podcasts").select(EXISTING_COLUMNS).in_("id", batch).execute()
+            existing_rows.update((record["id"], record) for record in response.data or [])
+    except Exception as e:
+        logger.error(f"Error checking existing podcasts: {str(e)}")
+        metadata_executor.shutdown(cancel_futures=True)
+        return {"error": f"Failed to check existing podcasts: {str(e)}"}
+    
+    # New podcasts need a valid user_id; it can't change during one run, so look it up once
+    default_user_id = None
+    if len(existing_rows) < len(podcast_ids):
+        default_user_id = _most_frequent_user_id(supabase)
+    
+    # Rows are collected per file and written in bulk after the loop
+    rows_to_update = []
+    rows_to_create = []
+    
+    # For each MP3 file, find the corresponding JSON and build its Supabase record
+    for mp3_file, podcast_id in zip(mp3_files, podcast_ids):
+        url = STATIC_PREFIX + mp3_file
         
         try:
             # Check if JSON metadata exists
-            if not os.path.exists(json_file):
+            if podcast_id not in metadata_futures:
                 logger.warning(f"No metadata file found for {podcast_id}")
                 results["skipped"] += 1
                 results["details"].append({
@@ -77,29 +133,26 @@ def sync_podcasts_with_supabase():
                 continue
             
             # Read metadata
-            with open(json_file, 'r') as f:
-                try:
-                    data = json.load(f)
-                    metadata = data.get("metadata", {})
-                    transcript = data.get("transcript", "")
-                except json.JSONDecodeError:
-                    logger.error(f"Invalid JSON in metadata file for {podcast_id}")
-                    results["failed"] += 1
-                    results["details"].append({
-                        "podcast_id": podcast_id,
-                        "status": "failed",
-                        "reason": "Invalid JSON in metadata file"
-                    })
-                    continue
-            
-            # Check if podcast already exists in Supabase
-            response = supabase.table("podcasts").select("*").eq("id", podcast_id).execute()
+            try:
+                data = metadata_futures[podcast_id].result()
+                metadata = data.get("metadata", {})
+                transcript = data.get("transcript", "")
+            except orjson.JSONDecodeError:
+                logger.error(f"Invalid JSON in metadata file for {podcast_id}")
+                results["failed"] += 1
+                results["details"].append({
+                    "podcast_id": podcast_id,
+                    "status": "failed",
+                    "reason": "Invalid JSON in metadata file"
+                })
+                continue
             
-            if response.data and len(response.data) > 0:
+            if podcast_id in existing_rows:
                 # Update existing record - only include fields that exist in the schema
                 update_data = {
+                    **existing_rows[podcast_id],
                     "status": "completed",
-                    "url": f"/static/podcasts/{mp3_file}",
+                    "url": url,
                     "metadata": metadata,
                     "transcript": transcript
                 }
@@ -108,50 +161,15 @@ def sync_podcasts_with_supabase():
                 if metadata.get("topics"):
                     update_data["topics"] = metadata.get("topics")
                 
-                update_response = supabase.table("podcasts").update(update_data).eq("id", podcast_id).execute()
-                
-                if hasattr(update_response, 'error') and update_response.error:
-                    logger.error(f"Failed to update podcast {podcast_id}: {update_response.error}")
-                    results["failed"] += 1
-                    results["details"].append({
-                        "podcast_id": podcast_id,
-                        "status": "failed",
-                        "reason": f"Update failed: {update_response.error}"
-                    })
-                else:
-                    logger.info(f"Updated podcast {podcast_id} in Supabase")
-                    results["updated"] += 1
-                    results["details"].append({
-                        "podcast_id": podcast_id,
-                        "status": "updated"
-                    })
+                rows_to_update.append(update_data)
             else:
                 # Create new record
-                # We need to find a valid user_id to associate with the podcast
-                # First, check if any records exist in the podcasts table
-                users_response = supabase.table("podcasts").select("user_id").execute()
-                
-                # Default user ID - use a hardcoded value as fallback
-                user_id = "user_2wNeXyyGo1hYZZuoZ2QlV7yZwbO"
-                
-                if users_response.data and len(users_response.data) > 0:
-                    # Find the most frequent user_id in existing records
-                    user_counts = {}
-                    for record in users_response.data:
-                        if record.get("user_id"):
-                            uid = record.get("user_id")
-                            user_counts[uid] = user_counts.get(uid, 0) + 1
-                    
-                    if user_counts:
-                        # Get most common user_id
-                        user_id = max(user_counts.items(), key=lambda x: x[1])[0]
-                
                 # Create basic record with only fields that exist in the schema
                 create_data = {
                     "id": podcast_id,
-                    "user_id": user_id,
+                    "user_id": default_user_id,
                     "status": "completed",
-                    "url": f"/static/podcasts/{mp3_file}",
+                    "url": url,
                     "metadata": metadata,
                     "transcript": transcript,
                     "duration": metadata.get("target_duration_seconds", 300),
@@ -162,25 +180,7 @@ def sync_podcasts_with_supabase():
                     "language": "en-US"  # Default language
                 }
                 
-                create_response = supabase.table("podcasts").insert(create_data).execute()
-                
-                if hasattr(create_response, 'error') and create_response.error:
-                    logger.error(f"Failed to create podcast {podcast_id}: {create_response.error}")
-                    results["failed"] += 1
-                    results["details"].append({
-                        "podcast_id": podcast_id,
-                        "status": "failed",
-                        "reason": f"Create failed: {create_response.error}"
-                    })
-                else:
-                    logger.info(f"Created podcast {podcast_id} in Supabase")
-                    results["created"] += 1
-                    results["details"].append({
-                        "podcast_id": podcast_id,
-                        "status": "created"
-                    })
-            
-            results["processed"] += 1
+                rows_to_create.append(create_data)
             
         except Exception as e:
             logger.error(f"Error processing podcast {podcast_id}: {str(e)}")
@@ -191,8 +191,104 @@ def sync_podcasts_with_supabase():
                 "reason": str(e)
             })
     
+    metadata_executor.shutdown()
+    
+    # Write the collected rows in one RPC per batch when the database function exists;
+    # otherwise existing podcasts go through upsert and new ones through insert
+    if not _sync_with_rpc(supabase, rows_to_update, rows_to_create, results):
+        _write_in_batches(
+            rows_to_update,
+            lambda rows: supabase.table("podcasts").upsert(rows, on_conflict="id").execute(),
+            "updated", results
+        )
+        _write_in_batches(
+            rows_to_create,
+            lambda rows: supabase.table("podcasts").insert(rows).execute(),
+            "created", results
+        )
+    
     return results
 
+def _load_metadata(json_file: str) -> dict:
+    """Read a podcast's metadata JSON file; raises orjson.JSONDecodeError if it is invalid."""
+    with open(json_file, 'rb') as f:
+        return orjson.loads(f.read())
+
+def _most_frequent_user_id(supabase: Client) -> str:
+    """Return the user_id owning the most podcasts, falling back to a hardcoded default."""
+    # Default user ID - use a hardcoded value as fallback
+    user_id = "user_2wNeXyyGo1hYZZuoZ2QlV7yZwbO"
+    
+    try:
+        users_response = supabase.table("podcasts").select("user_id").not_.is_("user_id", "null").execute()
+    except Exception as e:
+        logger.error(f"Error looking up existing user IDs: {str(e)}")
+        return user_id
+    
+    # Find the most frequent user_id in existing records
+    user_counts = Counter(record["user_id"] for record in users_response.data or [] if record.get("user_id"))
+    if user_counts:
+        user_id = user_counts.most_common(1)[0][0]
+    return user_id
+
+def _sync_with_rpc(supabase: Client, rows_to_update, rows_to_create, results) -> bool:
+    """
+    Write all rows through the sync_podcasts() database function (see supabase-alter.sql),
+    which upserts a JSON array of rows in one call. Returns False without recording anything
+    if the first call fails, e.g. because the function hasn't been created.
+    """
+    rows = [(row, "updated") for row in rows_to_update] + [(row, "created") for row in rows_to_create]
+    for start in range(0, len(rows), WRITE_BATCH_SIZE):
+        batch = rows[start:start + WRITE_BATCH_SIZE]
+        try:
+            supabase.rpc("sync_podcasts", {"rows": [row for row, _ in batch]}).execute()
+            error = None
+        except Exception as e:
+            if start == 0:
+                logger.warning(f"sync_podcasts RPC failed, falling back to bulk writes: {str(e)}")
+                return False
+            error = str(e)
+        
+        for row, status in batch:
+            _record_write(results, row["id"], status, error)
+    return True
+
+def _write_in_batches(rows, write, status, results):
+    """
+    Write rows to Supabase WRITE_BATCH_SIZE at a time, recording each row's outcome in results
+    under the given status ("updated"/"created"), or as failed with the batch's error.
+    """
+    for start in range(0, len(rows), WRITE_BATCH_SIZE):
+        batch = rows[start:start + WRITE_BATCH_SIZE]
+        try:
+            response = write(batch)
+            error = response.error if hasattr(response, 'error') else None
+        except Exception as e:
+            error = str(e)
+        
+        for row in batch:
+            _record_write(results, row["id"], status, error)
+
+def _record_write(results, podcast_id, status, error):
+    """Record one row's write outcome in results."""
+    if error:
+        action = "Update" if status == "updated" else "Create"
+        logger.error(f"Failed to {action.lower()} podcast {podcast_id}: {error}")
+        results["failed"] += 1
+        results["details"].append({
+            "podcast_id": podcast_id,
+            "status": "failed",
+            "reason": f"{action} failed: {error}"
+        })
+    else:
+        logger.info(f"{status.capitalize()} podcast {podcast_id} in Supabase")
+        results[status] += 1
+        results["processed"] += 1
+        results["details"].append({
+            "podcast_id": podcast_id,
+            "status": status
+        })
+
 if __name__ == "__main__":
     print("Starting podcast sync utility...")
     results = sync_podcasts_with_supabase()
@@ -1,7 +1,9 @@
 import logging
+import logging.handlers
 import os
+import queue
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
@@ -11,14 +13,25 @@ from src.utils import ensure_directories_exist
 # Load environment variables
 load_dotenv()
 
-# Configure logging
+# Configure logging. Request handlers only put records on a queue; a background
+# listener thread does the file and console writes
+log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+log_handlers = [logging.FileHandler('app.log'), logging.StreamHandler()]
+for handler in log_handlers:
+    handler.setFormatter(log_formatter)
+
+log_queue = queue.Queue(-1)
+log_listener = logging.handlers.QueueListener(log_queue, *log_handlers, respect_handler_level=True)
+log_listener.start()
+
+# The queue handler only merges the message arguments; log_formatter is applied once,
+# on the listener side
+queue_handler = logging.handlers.QueueHandler(log_queue)
+queue_handler.setFormatter(logging.Formatter('%(message)s'))
+
 logging.basicConfig(
     level=os.getenv("LOG_LEVEL", "INFO"),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('app.log'),
-        logging.StreamHandler()
-    ]
+    handlers=[queue_handler]
 )
 
 logger = logging.getLogger("ai-podcast-producer")
@@ -27,16 +40,20 @@ logger = logging.getLogger("ai-podcast-producer")
 app = FastAPI(
     title="AI Podcast Producer",
     description="An AI-powered system that automatically generates podcasts from news articles",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # In production, replace with specific origins
+    # Browsers won't cache preflights for a wildcard origin with credentials, so list the
+    # frontend origins explicitly (comma-separated in FRONTEND_ORIGINS)
+    allow_origins=[origin.strip() for origin in os.getenv("FRONTEND_ORIGINS", "http://localhost:5173").split(",") if origin.strip()],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=86400,
 )
 
 # Ensure required directories exist
@@ -44,6 +61,8 @@ ensure_directories_exist([
     "static/podcasts",
     "logs",
     "data",
+    "data/tts_cache",
+    "data/llm_cache",
     "config"
 ])
 
@@ -53,6 +72,11 @@ app.mount("/static", StaticFiles(directory="static"), name="static")
 # Include API routes
 app.include_router(router, prefix="/api")
 
+@app.on_event("shutdown")
+def stop_log_listener():
+    """Flush queued log records before the process exits."""
+    log_listener.stop()
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
@@ -66,7 +90,7 @@ async def health_check():
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc: HTTPException):
     """Handle HTTP exceptions"""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={"detail": exc.detail},
     )
@@ -75,7 +99,7 @@ async def http_exception_handler(request, exc: HTTPException):
 async def general_exception_handler(request, exc: Exception):
     """Handle general exceptions"""
     logger.error(f"Unhandled exception: {str(exc)}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"detail": "Internal server error"},
     )
@@ -1,9 +1,20 @@
 import os
 import logging
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import io
-from typing import List, Dict
+import time
+import shutil
+import subprocess
+import tempfile
+import hashlib
+import threading
+import uuid
+from typing import BinaryIO, List, Dict, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from dotenv import load_dotenv
 from datetime import datetime
 
@@ -13,14 +24,53 @@ try:
 except ImportError:
     pydub_available = False
 
+try:
+    import numpy as np
+    numpy_available = True
+except ImportError:
+    numpy_available = False
+
 load_dotenv()
 logger = logging.getLogger("ai-podcast-producer")
 
+# How long the voice list is reused before it is fetched from ElevenLabs again
+VOICES_CACHE_TTL = 45.0
+
+# Maximum number of concurrent text-to-speech requests in convert_many
+TTS_MAX_WORKERS = 8
+
+# Text-to-speech endpoint; the voice ID is appended
+ELEVENLABS_TTS_URL = "https://api.elevenlabs.io/v1/text-to-speech/"
+
+# (connect, read) timeouts for ElevenLabs requests
+ELEVENLABS_TIMEOUT = (3.05, 60)
+
+# Size of the chunks read from a streamed text-to-speech response
+TTS_CHUNK_SIZE = 64 * 1024
+
+# Synthesized lines are cached on disk by voice and text, so stock phrases like the
+# podcast intro and outro are only sent to ElevenLabs once per voice. Entries expire
+# after TTS_CACHE_TTL seconds, and the oldest are evicted beyond TTS_CACHE_MAX_BYTES.
+TTS_CACHE_DIR = "data/tts_cache"
+TTS_CACHE_TTL = 7 * 24 * 3600
+TTS_CACHE_MAX_BYTES = 512 * 1024 * 1024
+# Minimum seconds between two prunes of the cache directory
+TTS_CACHE_PRUNE_INTERVAL = 3600
+
+# Gap written between segments by the simple merge fallback (0.3 seconds at 44.1kHz)
+SIMPLE_MERGE_SILENCE = b"\0" * 13230
+
 class AudioProcessor:
     """
     AudioProcessor handles TTS via ElevenLabs and merges audio segments if pydub is available.
     If pydub is unavailable (and audioop is missing), merging is disabled.
     """
+    # Intro/outro/transition file contents by path, shared by all instances
+    _asset_cache: Dict[str, bytes] = {}
+    # When the TTS cache directory was last pruned, see _prune_tts_cache
+    _tts_cache_pruned_at = 0.0
+    _tts_cache_prune_lock = threading.Lock()
+
     def __init__(self):
         # Check for both common environment variable names
         self.eleven_api_key = (
@@ -30,26 +80,70 @@ class AudioProcessor:
         if not self.eleven_api_key:
             logger.warning("Neither ELEVENLABS_API_KEY nor ELEVEN_API_KEY found in environment variables. Audio generation and voice listing may be mocked or fail.")
 
+        # Keep-alive connection pools shared by every ElevenLabs call, sized for concurrent TTS.
+        # Rate limits and transient upstream errors on GETs are retried with backoff.
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=64,
+            max_retries=Retry(
+                total=2,
+                backoff_factor=0.2,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=frozenset(["GET"]),
+                # Return the last response so its error message is still reported
+                raise_on_status=False
+            )
+        ))
+        # Text-to-speech is billed per character, so a POST is only repeated when it was
+        # rejected up front (429) or never sent; 5xx and read errors fall back to mock audio
+        self.session.mount(ELEVENLABS_TTS_URL, HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=64,
+            max_retries=Retry(
+                total=2,
+                read=0,
+                backoff_factor=0.2,
+                status_forcelist=[429],
+                allowed_methods=frozenset(["POST"]),
+                raise_on_status=False
+            )
+        ))
+        if self.eleven_api_key:
+            self.session.headers["xi-api-key"] = self.eleven_api_key
+
+        # Voice list cache, see get_available_voices
+        self._voices_cache = None
+        self._voices_cache_ts = 0.0
+        self._voice_ids = set()
+
     def convert_text_to_speech(self, text: str, voice_id: str) -> bytes:
         """
         Convert text to speech using ElevenLabs API.
         Returns the audio content as bytes, or raises an exception on failure.
         """
+        buffer = io.BytesIO()
+        self.write_speech(text, voice_id, buffer)
+        return buffer.getvalue()
+
+    def write_speech(self, text: str, voice_id: str, f: BinaryIO) -> None:
+        """
+        Convert text to speech using ElevenLabs API, writing the MP3 to f in chunks as it
+        is received rather than holding the whole response in memory.
+        Raises an exception on failure.
+        """
         try:
-            url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}"
-            headers = {
-                "xi-api-key": self.eleven_api_key,
-                "Content-Type": "application/json"
-            }
+            url = f"{ELEVENLABS_TTS_URL}{voice_id}"
             payload = {
                 "text": text,
                 "model_id": "eleven_multilingual_v2",
                 "output_format": "mp3_44100_128"
             }
-            response = requests.post(url, json=payload, headers=headers)
-            if response.status_code == 200:
-                return response.content
-            else:
+            with self.session.post(url, json=payload, timeout=ELEVENLABS_TIMEOUT, stream=True) as response:
+                if response.status_code == 200:
+                    for chunk in response.iter_content(chunk_size=TTS_CHUNK_SIZE):
+                        f.write(chunk)
+                    return
                 error_msg = response.text
                 try:
                     error_data = response.json()
@@ -62,20 +156,136 @@ class AudioProcessor:
             logger.error(f"Error in text-to-speech conversion: {str(e)}")
             raise
 
+    def speak_cached(self, text: str, voice_id: str) -> bytes:
+        """
+        Like convert_text_to_speech, but reuses audio synthesized for the same voice and
+        text within the last TTS_CACHE_TTL seconds. Raises an exception on failure.
+        """
+        key = hashlib.blake2b(f"{voice_id}|{text}".encode(), digest_size=16).hexdigest()
+        cache_file = os.path.join(TTS_CACHE_DIR, f"{key}.mp3")
+        try:
+            if time.time() - os.path.getmtime(cache_file) <= TTS_CACHE_TTL:
+                with open(cache_file, 'rb') as f:
+                    return f.read()
+        except OSError:
+            pass
+        
+        # Stream the audio straight into a temp file and rename it into place, so the
+        # response is never held in memory and readers never see a partial file
+        tmp_file = f"{cache_file}.{uuid.uuid4().hex}.tmp"
+        try:
+            os.makedirs(TTS_CACHE_DIR, exist_ok=True)
+            with open(tmp_file, 'wb') as f:
+                self.write_speech(text, voice_id, f)
+            os.replace(tmp_file, cache_file)
+            with open(cache_file, 'rb') as f:
+                audio = f.read()
+        except Exception as e:
+            self._remove_cache_file(tmp_file)
+            # requests' connection errors are OSErrors too, but only disk errors are recoverable
+            if not isinstance(e, OSError) or isinstance(e, requests.RequestException):
+                raise
+            logger.warning(f"Could not cache synthesized audio: {str(e)}")
+            return self.convert_text_to_speech(text, voice_id)
+        self._prune_tts_cache()
+        return audio
+
+    @classmethod
+    def _prune_tts_cache(cls):
+        """
+        Delete expired TTS cache entries, then the oldest ones while the cache is over
+        TTS_CACHE_MAX_BYTES. Runs at most once per TTS_CACHE_PRUNE_INTERVAL per process.
+        """
+        now = time.time()
+        with cls._tts_cache_prune_lock:
+            if now - cls._tts_cache_pruned_at < TTS_CACHE_PRUNE_INTERVAL:
+                return
+            cls._tts_cache_pruned_at = now
+        
+        entries = []
+        try:
+            with os.scandir(TTS_CACHE_DIR) as it:
+                for entry in it:
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    # Leftover temp files from an interrupted write are only removed once
+                    # they're old enough not to belong to a write in progress
+                    if now - stat.st_mtime > TTS_CACHE_TTL or (
+                            entry.name.endswith(".tmp") and now - stat.st_mtime > TTS_CACHE_PRUNE_INTERVAL):
+                        cls._remove_cache_file(entry.path)
+                    elif entry.name.endswith(".mp3"):
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError as e:
+            logger.warning(f"Could not prune TTS cache: {str(e)}")
+            return
+        
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= TTS_CACHE_MAX_BYTES:
+                break
+            cls._remove_cache_file(path)
+            total_size -= size
+
+    @staticmethod
+    def _remove_cache_file(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def convert_many(self, items: List[Tuple[str, str]], use_cache: bool = False) -> List[bytes]:
+        """
+        Convert several (text, voice_id) pairs to speech concurrently over the pooled session,
+        going through speak_cached if use_cache is set.
+        Returns the audio in the same order as items; an item that fails gets mock audio.
+        """
+        def convert(item: Tuple[str, str]) -> bytes:
+            text, voice_id = item
+            try:
+                if use_cache:
+                    return self.speak_cached(text, voice_id)
+                return self.convert_text_to_speech(text, voice_id)
+            except Exception:
+                # write_speech has already logged the error
+                return self.generate_mock_audio()
+
+        if not items:
+            return []
+        with ThreadPoolExecutor(max_workers=min(TTS_MAX_WORKERS, len(items))) as executor:
+            return list(executor.map(convert, items))
+
     def get_available_voices(self) -> List[Dict]:
+        """
+        Get list of available voices from ElevenLabs, cached for VOICES_CACHE_TTL seconds.
+        If a refresh fails, the last successfully fetched list is returned instead.
+        """
+        now = time.monotonic()
+        if self._voices_cache is not None and now - self._voices_cache_ts < VOICES_CACHE_TTL:
+            return self._voices_cache
+
+        voices = self._fetch_available_voices()
+        if voices:
+            self._voices_cache = voices
+            self._voices_cache_ts = now
+            self._voice_ids = {voice["voice_id"] for voice in voices}
+        elif self._voices_cache is not None:
+            logger.warning("Refreshing the voice list failed, using the last known voices")
+            return self._voices_cache
+        return voices
+
+    def _fetch_available_voices(self) -> List[Dict]:
         """Get list of available voices from ElevenLabs"""
         try:
             url = "https://api.elevenlabs.io/v1/voices"
-            headers = {
-                "xi-api-key": self.eleven_api_key,
-                "accept": "application/json"
-            }
+            headers = {"accept": "application/json"}
             # Only proceed if API key is set
             if not self.eleven_api_key:
                 logger.error("Cannot fetch voices: ElevenLabs API key is not configured.")
                 return self._get_mock_voices() # Return mock voices if no key
 
-            response = requests.get(url, headers=headers)
+            response = self.session.get(url, headers=headers, timeout=ELEVENLABS_TIMEOUT)
             if response.status_code == 200:
                 data = response.json()
                 logger.info(f"Successfully fetched {len(data.get('voices', []))} voices from ElevenLabs.")
@@ -116,8 +326,9 @@ class AudioProcessor:
     def validate_voice_id(self, voice_id: str) -> bool:
         """Validate that a voice ID exists among available voices"""
         try:
-            available_voices = self.get_available_voices()
-            return any(voice["voice_id"] == voice_id for voice in available_voices)
+            # Refreshes self._voice_ids when the cached list has expired
+            self.get_available_voices()
+            return voice_id in self._voice_ids
         except Exception as e:
             logger.error(f"Error validating voice ID: {str(e)}")
             return False
@@ -137,25 +348,34 @@ class AudioProcessor:
                 pass
             return
         
+        # Joining the MP3 frames directly avoids decoding and re-encoding every segment
+        if self._merge_audio_ffmpeg(audio_contents, output_file):
+            logger.info(f"Successfully merged {len(audio_contents)} audio segments to {output_file} with ffmpeg")
+            return
+        
         if pydub_available:
             try:
                 import io
                 from pydub import AudioSegment
 
                 segments = []
+                # 0.3 second silence between segments, built once and reused
+                silence = AudioSegment.silent(duration=300)
                 # Convert each audio content to AudioSegment
                 for audio_bytes in audio_contents:
                     segment = AudioSegment.from_mp3(io.BytesIO(audio_bytes))
                     segments.append(segment)
-                    # Add 0.3 second silence between segments
-                    segments.append(AudioSegment.silent(duration=300))
+                    segments.append(silence)
 
                 # Remove the last silence we added
                 if segments:
                     segments.pop()
 
-                # Combine all segments
-                final_audio = sum(segments)
+                # Combine all segments. Adding them one by one (sum) copies the growing
+                # result for every segment; instead bring them to a common sample rate,
+                # width and channel count and join the raw PCM in a single copy
+                segments = AudioSegment._sync(*segments)
+                final_audio = segments[0]._spawn(b"".join(segment.raw_data for segment in segments))
 
                 # Export the final audio
                 final_audio.export(output_file, format="mp3")
@@ -167,15 +387,79 @@ class AudioProcessor:
             logger.warning("pydub not available, falling back to simple concatenation")
             self._merge_audio_simple(audio_contents, output_file)
 
+    def _merge_audio_ffmpeg(self, audio_contents: List[bytes], output_file: str) -> bool:
+        """
+        Concatenate MP3 segments with 0.3 second silences using ffmpeg's concat demuxer
+        without re-encoding. Returns False if ffmpeg is unavailable or the copy fails,
+        e.g. because the segments don't share a format.
+        """
+        silence = self._generate_mp3_silence()
+        if silence is None:
+            return False
+
+        try:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                silence_file = os.path.join(tmp_dir, "silence.mp3")
+                with open(silence_file, "wb") as f:
+                    f.write(silence)
+
+                entries = []
+                for i, audio_bytes in enumerate(audio_contents):
+                    segment_file = os.path.join(tmp_dir, f"seg_{i}.mp3")
+                    with open(segment_file, "wb") as f:
+                        f.write(audio_bytes)
+                    if i:
+                        entries.append(f"file '{silence_file}'")
+                    entries.append(f"file '{segment_file}'")
+
+                list_file = os.path.join(tmp_dir, "list.txt")
+                with open(list_file, "w") as f:
+                    f.write("\n".join(entries))
+
+                result = subprocess.run(
+                    ["ffmpeg", "-y", "-v", "error", "-f", "concat", "-safe", "0", "-i", list_file,
+                     "-c", "copy", output_file],
+                    capture_output=True,
+                    timeout=300
+                )
+            if result.returncode != 0:
+                logger.warning(f"ffmpeg concatenation failed: {result.stderr.decode(errors='replace').strip()}")
+                return False
+            return True
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.warning(f"ffmpeg concatenation failed: {str(e)}")
+            return False
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _generate_mp3_silence() -> Optional[bytes]:
+        """
+        Encode 0.3 seconds of silence in ElevenLabs' mp3_44100_128 format, or return None
+        if ffmpeg is not available.
+        """
+        if not shutil.which("ffmpeg"):
+            return None
+        try:
+            result = subprocess.run(
+                ["ffmpeg", "-v", "error", "-f", "lavfi", "-i", "anullsrc=r=44100:cl=mono", "-t", "0.3",
+                 "-c:a", "libmp3lame", "-b:a", "128k", "-f", "mp3", "pipe:1"],
+                capture_output=True,
+                timeout=30
+            )
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.warning(f"Could not generate silence with ffmpeg: {str(e)}")
+            return None
+        if result.returncode != 0 or not result.stdout:
+            logger.warning(f"Could not generate silence with ffmpeg: {result.stderr.decode(errors='replace').strip()}")
+            return None
+        return result.stdout
+
     def _merge_audio_simple(self, audio_contents: List[bytes], output_file: str):
         """Simple audio merging fallback"""
         try:
+            # Add small silence between segments, writing the result in one go
             with open(output_file, "wb") as f:
-                for i, chunk in enumerate(audio_contents):
-                    f.write(chunk)
-                    # Add small silence between segments
-                    if i < len(audio_contents) - 1:
-                        f.write(b"\0" * 13230)  # 0.3 seconds at 44.1kHz
+                f.write(SIMPLE_MERGE_SILENCE.join(audio_contents))
         except Exception as e:
             logger.error(f"Error in simple audio merge: {str(e)}")
             raise
@@ -185,8 +469,7 @@ class AudioProcessor:
         try:
             music_path = os.path.join("static", "assets", "intro_music.mp3")
             if os.path.exists(music_path):
-                with open(music_path, 'rb') as f:
-                    return f.read()
+                return self._read_asset(music_path)
             return self._generate_mp3_tone(duration_ms=5000, frequency=440)  # 5 seconds
         except Exception as e:
             logger.error(f"Error loading intro music: {str(e)}")
@@ -197,8 +480,7 @@ class AudioProcessor:
         try:
             music_path = os.path.join("static", "assets", "outro_music.mp3")
             if os.path.exists(music_path):
-                with open(music_path, 'rb') as f:
-                    return f.read()
+                return self._read_asset(music_path)
             return self._generate_mp3_tone(duration_ms=5000, frequency=440)  # 5 seconds
         except Exception as e:
             logger.error(f"Error loading outro music: {str(e)}")
@@ -209,14 +491,26 @@ class AudioProcessor:
         try:
             sound_path = os.path.join("static", "assets", "transition.mp3")
             if os.path.exists(sound_path):
-                with open(sound_path, 'rb') as f:
-                    return f.read()
+                return self._read_asset(sound_path)
             return self._generate_mp3_tone(duration_ms=800, frequency=880)  # 0.8 seconds
         except Exception as e:
             logger.error(f"Error loading transition sound: {str(e)}")
             return self._generate_mp3_tone(duration_ms=800, frequency=880)
 
-    def _generate_mp3_tone(self, duration_ms: int = 1000, frequency: float = 440.0) -> bytes:
+    @classmethod
+    def _read_asset(cls, path: str) -> bytes:
+        """Read an audio asset file, keeping its bytes in memory for later calls."""
+        content = cls._asset_cache.get(path)
+        if content is None:
+            with open(path, 'rb') as f:
+                content = f.read()
+            cls._asset_cache[path] = content
+        return content
+
+    # The generated tones depend only on their arguments, so each one is encoded once per process
+    @staticmethod
+    @lru_cache(maxsize=16)
+    def _generate_mp3_tone(duration_ms: int = 1000, frequency: float = 440.0) -> bytes:
         """Generate an MP3 tone using pydub"""
         try:
             from pydub import AudioSegment
@@ -237,9 +531,10 @@ class AudioProcessor:
             
         except ImportError:
             logger.warning("pydub not available, falling back to raw PCM generation")
-            return self._generate_raw_tone(duration_ms, frequency)
+            return AudioProcessor._generate_raw_tone(duration_ms, frequency)
 
-    def _generate_raw_tone(self, duration_ms: int = 1000, frequency: float = 440.0) -> bytes:
+    @staticmethod
+    def _generate_raw_tone(duration_ms: int = 1000, frequency: float = 440.0) -> bytes:
         """
         Generate a simple musical tone as a fallback when music files are not available.
         Args:
@@ -256,32 +551,47 @@ class AudioProcessor:
         amplitude = 0.5
         num_samples = int((duration_ms / 1000.0) * sample_rate)
         
-        # Generate sine wave
-        samples = []
-        for i in range(num_samples):
-            sample = amplitude * math.sin(2 * math.pi * frequency * i / sample_rate)
-            # Convert to 16-bit integer
-            packed_sample = struct.pack('h', int(sample * 32767))
-            samples.append(packed_sample)
+        if numpy_available:
+            # Generate the whole sine wave at once, then ramp the first and last
+            # 100ms linearly from and to silence
+            wave = amplitude * 32767 * np.sin(2 * np.pi * frequency * np.arange(num_samples) / sample_rate)
+            fade_samples = min(int(sample_rate * 0.1), num_samples // 2)
+            ramp = np.arange(fade_samples) / fade_samples
+            wave[:fade_samples] *= ramp
+            wave[num_samples - fade_samples:] *= ramp[::-1]
+            return wave.astype(np.int16).tobytes()
         
-        # Add fade in/out
-        fade_samples = int(sample_rate * 0.1)  # 100ms fade
-        for i in range(fade_samples):
-            factor = i / fade_samples
-            packed_sample = struct.pack('h', int(factor * struct.unpack('h', samples[i])[0]))
-            samples[i] = packed_sample
-            
-            factor = 1 - (i / fade_samples)
-            packed_sample = struct.pack('h', int(factor * struct.unpack('h', samples[-(i+1)])[0]))
-            samples[-(i+1)] = packed_sample
+        # Write each sample straight into a preallocated buffer, applying the same
+        # 100ms fade in/out as above
+        fade_samples = min(int(sample_rate * 0.1), num_samples // 2)
+        fade_out_start = num_samples - fade_samples
+        buf = bytearray(2 * num_samples)
+        pack_into = struct.Struct('<h').pack_into
+        step = 2 * math.pi * frequency / sample_rate
+        scale = amplitude * 32767
+        for i in range(num_samples):
+            sample = scale * math.sin(step * i)
+            if i < fade_samples:
+                sample *= i / fade_samples
+            elif i >= fade_out_start:
+                sample *= (num_samples - 1 - i) / fade_samples
+            pack_into(buf, 2 * i, int(sample))
         
-        return b''.join(samples)
+        return bytes(buf)
+
+@lru_cache(maxsize=1)
+def get_audio_processor() -> AudioProcessor:
+    """
+    Return the AudioProcessor shared by the whole process, so its connection pool and
+    voice cache are reused instead of rebuilt on every call.
+    """
+    return AudioProcessor()
 
 def process_audio(text: str, voice_id: str) -> bytes:
     """
     High-level function to process text to audio.
     """
-    processor = AudioProcessor()
+    processor = get_audio_processor()
     if not processor.eleven_api_key:
         logger.warning("Using mock audio generation because no ElevenLabs API key is set.")
         return processor.generate_mock_audio()
@@ -300,5 +610,5 @@ def merge_audio_segments(segments: List[bytes], output_file: str):
     """
     Merge multiple audio segments using AudioProcessor's fallback if pydub is unavailable.
     """
-    processor = AudioProcessor()
+    processor = get_audio_processor()
     processor.merge_audio_files(segments, output_file)
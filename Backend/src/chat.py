@@ -1,14 +1,19 @@
 import logging
-from typing import Dict, Any
+from collections import deque
+from typing import Dict, Any, Iterator
 import os
 from dotenv import load_dotenv
 from openai import OpenAI
-from src.audio import process_audio, AudioProcessor
+from src.audio import process_audio, get_audio_processor
+from src.utils import get_openai_http_client, get_cached_completion, set_cached_completion
 
 load_dotenv()
 logger = logging.getLogger("ai-podcast-producer")
 
 class ChatBot:
+    # Chat model used for replies
+    MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+
     def __init__(self, name: str, personality: str, instructions: str, voice: str):
         """
         Initialize a chatbot with specific personality and voice.
@@ -24,10 +29,16 @@ class ChatBot:
         self.instructions = instructions
         self.voice = voice
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
-        # Initialize OpenAI client without any proxy configuration
-        self.client = OpenAI(api_key=self.openai_api_key)
-        self.audio_processor = AudioProcessor()
-        self.conversation_history = []
+        # Initialize OpenAI client on the shared connection pool
+        self.client = OpenAI(api_key=self.openai_api_key, http_client=get_openai_http_client())
+        self.audio_processor = get_audio_processor()
+        # Built once so the prompt prefix is identical on every call
+        self._system_message = {
+            "role": "system",
+            "content": f"You are {self.name}. {self.personality}\n\nInstructions: {self.instructions}"
+        }
+        # Only the last 5 messages are sent for context
+        self.conversation_history = deque(maxlen=5)
 
     def chat(self, message: str) -> str:
         """
@@ -40,48 +51,67 @@ class ChatBot:
             str: The generated response
         """
         try:
-            # Add message to conversation history
-            self.conversation_history.append({"role": "user", "content": message})
-            
-            # Prepare the messages including system instructions
-            messages = [
-                {
-                    "role": "system",
-                    "content": f"You are {self.name}. {self.personality}\n\nInstructions: {self.instructions}"
-                }
-            ] + self.conversation_history[-5:]  # Keep last 5 messages for context
-            
-            # Generate response using the new API
-            response = self.client.chat.completions.create(
-                model="gpt-4",
-                messages=messages,
-                temperature=0.7,
-                max_tokens=1024
-            )
-            
-            # Extract response content
-            reply = response.choices[0].message.content.strip()
-            
-            # Add response to conversation history
-            self.conversation_history.append({"role": "assistant", "content": reply})
-            
-            return reply
-            
+            return "".join(self.chat_stream(message)).strip()
         except Exception as e:
             logger.error(f"Error in chat generation: {str(e)}")
             return self._fallback_response(message)
 
-    def speak(self, text: str) -> bytes:
+    def chat_stream(self, message: str) -> Iterator[str]:
+        """
+        Generate a response to a message, yielding pieces of it as the model produces them.
+        
+        Args:
+            message: The input message to respond to
+            
+        Yields:
+            str: The next piece of the response
+            
+        Raises:
+            Exception: If the OpenAI request fails
+        """
+        # Add message to conversation history
+        self.conversation_history.append({"role": "user", "content": message})
+        
+        # Prepare the messages including system instructions
+        messages = [self._system_message, *self.conversation_history]
+        
+        request = {
+            "model": self.MODEL,
+            "messages": messages,
+            "temperature": 0.7,
+            "max_tokens": 1024
+        }
+        reply = get_cached_completion(request)
+        if reply:
+            yield reply
+        else:
+            pieces = []
+            for chunk in self.client.chat.completions.create(**request, stream=True):
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    pieces.append(delta)
+                    yield delta
+            reply = "".join(pieces).strip()
+            if reply:
+                set_cached_completion(request, reply)
+        
+        # Add response to conversation history
+        self.conversation_history.append({"role": "assistant", "content": reply})
+
+    def speak(self, text: str, use_cache: bool = False) -> bytes:
         """
         Convert text to speech using the configured voice.
         
         Args:
             text: The text to convert to speech
+            use_cache: Reuse audio previously synthesized for the same voice and text
             
         Returns:
             bytes: The audio content
         """
         try:
+            if use_cache:
+                return self.audio_processor.speak_cached(text, self.voice)
             return self.audio_processor.convert_text_to_speech(text, self.voice)
         except Exception as e:
             logger.error(f"Error in text-to-speech conversion: {str(e)}")
@@ -93,4 +123,4 @@ class ChatBot:
 
     def clear_history(self):
         """Clear the conversation history"""
-        self.conversation_history = []
\ No newline at end of file
+        self.conversation_history.clear()
\ No newline at end of file
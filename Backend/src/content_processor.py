@@ -1,39 +1,48 @@
 import logging
-from typing import List, Dict, Any
+import re
+import orjson
+from collections import defaultdict
+from typing import List, Dict, Any, Set
 import os
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from openai import OpenAI
+from src.utils import get_openai_http_client, get_cached_completion, set_cached_completion
 from datetime import datetime
 
 load_dotenv()
 logger = logging.getLogger("ai-podcast-producer")
 
+# Speaking rate used to turn a target duration into a script length
+WORDS_PER_MINUTE = 150
+
+# Maximum number of topic segments generated at the same time
+MAX_CONCURRENT_TOPICS = 8
+
+# Maximum characters of each article's body included in the script prompt
+ARTICLE_CONTEXT_CHARS = 800
+
+# A "Speaker: text" line of a generated script
+SPEAKER_LINE_RE = re.compile(r'^([^:\n]*):[ \t]*(.*?)[ \t\r]*$', re.M)
+
 class ContentProcessor:
+    # Chat model used to write the script segments
+    MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+
     def __init__(self):
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
-        # Initialize OpenAI client without any proxy configuration
-        # Make sure no old environment variables with proxies are affecting the client
+        # Initialize OpenAI client on the shared connection pool, so every script request
+        # reuses an open connection to api.openai.com
         self.client = None
         try:
             self.client = OpenAI(
-                api_key=self.openai_api_key
+                api_key=self.openai_api_key,
+                http_client=get_openai_http_client()
             )
             logger.info("Successfully initialized OpenAI client")
         except Exception as e:
             logger.error(f"Error initializing OpenAI client: {str(e)}")
-            # Try alternative initialization if needed
-            try:
-                import httpx
-                # Create a custom httpx client with no proxies
-                http_client = httpx.Client(timeout=60.0)
-                self.client = OpenAI(
-                    api_key=self.openai_api_key,
-                    http_client=http_client
-                )
-                logger.info("Successfully initialized OpenAI client with custom httpx client")
-            except Exception as e2:
-                logger.error(f"Failed alternative OpenAI client initialization: {str(e2)}")
-                # Will attempt to create client on-the-fly in methods that need it
+            # Will attempt to create client on-the-fly in methods that need it
 
     def process_content(self, articles: List[Dict[str, Any]], target_duration_seconds: int = 300) -> Dict[str, Any]:
         """
@@ -43,8 +52,8 @@ class ContentProcessor:
             # Group articles by topic
             topics = self._group_articles_by_topic(articles)
             
-            # Calculate target word count (150 words per minute)
-            target_word_count = int((target_duration_seconds / 60) * 150)
+            # Calculate target word count from the speaking rate
+            target_word_count = int(target_duration_seconds * WORDS_PER_MINUTE // 60)
             
             # Create podcast script structure with metadata
             podcast_script = {
@@ -62,10 +71,18 @@ class ContentProcessor:
             }
             
             # Process each topic
-            words_per_topic = target_word_count // len(topics) if topics else 0
+            summaries = []
+            if topics:
+                words_per_topic = target_word_count // len(topics)
+                
+                # The topics are independent, so their GPT calls run concurrently; map keeps topic order
+                with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_TOPICS, len(topics))) as executor:
+                    summaries = list(executor.map(
+                        lambda item: self._generate_dual_speaker_content(item[0], item[1], words_per_topic),
+                        topics.items()
+                    ))
             
-            for topic, topic_articles in topics.items():
-                summary = self._generate_dual_speaker_content(topic, topic_articles, words_per_topic)
+            for (topic, topic_articles), summary in zip(topics.items(), summaries):
                 sources = [{"url": article["url"], "title": article["title"], "source": article["source"]["name"]} 
                           for article in topic_articles]
                 podcast_script["metadata"]["sources"].extend(sources)
@@ -87,29 +104,25 @@ class ContentProcessor:
 
     def _group_articles_by_topic(self, articles: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
         """Group articles by their topics"""
-        topics = {}
+        topics = defaultdict(list)
         for article in articles:
-            topic = article.get("topic", "general")
-            if topic not in topics:
-                topics[topic] = []
-            topics[topic].append(article)
-        return topics
+            topics[article.get("topic", "general")].append(article)
+        return dict(topics)
 
     def _generate_dual_speaker_content(self, topic: str, articles: List[Dict[str, Any]], target_words: int) -> str:
         """Generate conversational content between two hosts with proper flow"""
         try:
-            context = "\n\n".join([
+            context = "\n\n".join(
                 f"ARTICLE {i+1}:\nTitle: {article['title']}\n"
                 f"Source: {article['source']['name']}\n"
-                f"Content: {article.get('content', article.get('description', ''))}"
+                f"Content: {(article.get('content') or article.get('description') or '')[:ARTICLE_CONTEXT_CHARS]}"
                 for i, article in enumerate(articles[:5])
-            ])
-            
-            client = OpenAI(api_key=self.openai_api_key)
+            )
             
-            response = client.chat.completions.create(
-                model="gpt-4",
-                messages=[
+            request = {
+                "model": self.MODEL,
+                "response_format": {"type": "json_object"},
+                "messages": [
                     {"role": "system", "content": (
                         "You are writing a podcast script for two hosts named Alex and Sarah. "
                         "Create a natural conversation about the topic based on the provided articles. "
@@ -120,38 +133,53 @@ class ContentProcessor:
                         "3. Alternate between speakers naturally\n"
                         "4. Each speaker should acknowledge what the other just said before adding new information\n"
                         "5. Cite sources naturally within the conversation\n"
-                        "Format the output with 'Alex:' and 'Sarah:' prefixes."
+                        "Respond with a JSON object of the form "
+                        '{"turns": [{"speaker": "Alex", "text": "..."}, {"speaker": "Sarah", "text": "..."}]}, '
+                        "where speaker is either Alex or Sarah."
                     )},
                     {"role": "user", "content": f"Here are articles about {topic}:\n\n{context}\n\nCreate a conversational podcast segment following the rules above."}
                 ]
-            )
+            }
             
-            content = response.choices[0].message.content.strip()
+            turns = None
+            content = get_cached_completion(request)
+            if content is not None:
+                try:
+                    turns = self._parse_turns(content)
+                except ValueError:
+                    # An unusable cached reply is treated as a miss
+                    pass
+            if turns is None:
+                client = self.client or OpenAI(api_key=self.openai_api_key, http_client=get_openai_http_client())
+                response = client.chat.completions.create(**request)
+                content = response.choices[0].message.content.strip()
+                turns = self._parse_turns(content)
+                # Only replies that parse are cached, so a bad one isn't replayed
+                set_cached_completion(request, content)
             
             # Add additional validation to prevent repetition
-            lines = content.split('\n')
             filtered_lines = []
-            last_content = ""
+            # Word set of the last kept line, tokenized once when the line is kept
+            last_words = set()
             current_speaker = ""
             
-            for line in lines:
-                if not line.strip():
+            for turn in turns:
+                speaker = str(turn.get("speaker", "")).strip()
+                # Each turn becomes a single "Speaker: text" line of the script
+                text = " ".join(str(turn.get("text", "")).split())
+                if not speaker or not text:
+                    continue
+                
+                # Skip if it's the same speaker twice in a row or same/similar content
+                if speaker == current_speaker:
+                    continue
+                words = set(text.lower().split())
+                if self._is_similar_content(words, last_words):
                     continue
                     
-                # Extract speaker and content
-                if ':' in line:
-                    speaker, text = line.split(':', 1)
-                    text = text.strip()
-                    
-                    # Skip if it's the same speaker twice in a row or same/similar content
-                    if speaker == current_speaker:
-                        continue
-                    if self._is_similar_content(text, last_content):
-                        continue
-                        
-                    filtered_lines.append(f"{speaker}: {text}")
-                    last_content = text
-                    current_speaker = speaker
+                filtered_lines.append(f"{speaker}: {text}")
+                last_words = words
+                current_speaker = speaker
             
             return '\n\n'.join(filtered_lines)
             
@@ -159,20 +187,28 @@ class ContentProcessor:
             logger.error(f"Error in conversation generation: {str(e)}")
             return self._fallback_dual_speaker(topic, articles, target_words)
 
-    def _is_similar_content(self, text1: str, text2: str) -> bool:
-        """Check if two pieces of text are too similar"""
-        if not text1 or not text2:
+    def _parse_turns(self, content: str) -> List[Dict[str, Any]]:
+        """Parse the turns out of a JSON script reply; raises ValueError if it is malformed"""
+        data = orjson.loads(content)
+        turns = data.get("turns") if isinstance(data, dict) else None
+        if not isinstance(turns, list) or not all(isinstance(turn, dict) for turn in turns):
+            raise ValueError("Script reply has no list of turns")
+        return turns
+
+    def _is_similar_content(self, words1: Set[str], words2: Set[str]) -> bool:
+        """Check if two pieces of text, given as sets of lowercased words, are too similar"""
+        if not words1 or not words2:
             return False
-            
-        # Convert to sets of words for comparison
-        words1 = set(text1.lower().split())
-        words2 = set(text2.lower().split())
         
-        # Calculate similarity using Jaccard similarity
-        intersection = words1.intersection(words2)
-        union = words1.union(words2)
+        # Jaccard similarity can't exceed the ratio of the set sizes, so most
+        # pairs are ruled out without computing the intersection
+        smaller, larger = sorted((len(words1), len(words2)))
+        if smaller / larger <= 0.5:
+            return False
         
-        similarity = len(intersection) / len(union)
+        # Calculate similarity using Jaccard similarity
+        intersection = len(words1 & words2)
+        similarity = intersection / (len(words1) + len(words2) - intersection)
         return similarity > 0.5  # Threshold for similarity
 
     def _generate_full_transcript(self, segments: List[Dict[str, Any]]) -> str:
@@ -189,16 +225,13 @@ class ContentProcessor:
             last_speaker = "Sarah"  # Because intro ends with Sarah
             
             for segment in segments:
-                content = segment["content"]
-                lines = content.split('\n')
                 filtered_lines = []
                 
-                for line in lines:
-                    if ':' in line:
-                        speaker, _ = line.split(':', 1)
-                        if speaker != last_speaker:
-                            filtered_lines.append(line)
-                            last_speaker = speaker
+                for match in SPEAKER_LINE_RE.finditer(segment["content"]):
+                    speaker = match.group(1)
+                    if speaker != last_speaker:
+                        filtered_lines.append(match.group(0))
+                        last_speaker = speaker
                 
                 segment_contents.append('\n\n'.join(filtered_lines))
             
@@ -2,70 +2,120 @@ import os
 from typing import List, Dict, Any
 from dotenv import load_dotenv
 import logging
-import time
+from datetime import date, datetime, timedelta, timezone
 import random
+import asyncio
+import threading
+import aiohttp
+from cachetools import TTLCache
 from newsapi import NewsApiClient
 from newsapi.newsapi_exception import NewsAPIException
 
 load_dotenv()
 logger = logging.getLogger("ai-podcast-producer")
 
+NEWSAPI_EVERYTHING_URL = "https://newsapi.org/v2/everything"
+
+# Maximum number of topic queries sent to NewsAPI at the same time
+NEWSAPI_MAX_CONCURRENT_REQUESTS = 5
+
+# Largest pageSize NewsAPI accepts
+NEWSAPI_MAX_PAGE_SIZE = 100
+
+# NewsAPI error codes meaning the key itself was rejected
+NEWSAPI_AUTH_ERROR_CODES = {"apiKeyInvalid", "apiKeyDisabled", "apiKeyMissing"}
+
+# How long a topic's NewsAPI results are reused before it is queried again
+NEWSAPI_CACHE_TTL = 900
+
 class NewsCollector:
+    # Articles by (topic, from_date, page_size), shared by all instances
+    _articles_cache: TTLCache = TTLCache(maxsize=512, ttl=NEWSAPI_CACHE_TTL)
+    _articles_cache_lock = threading.Lock()
+    # Keys NewsAPI accepted (True) or rejected (False), checked once per key per process
+    _key_validated: Dict[str, bool] = {}
+
     def __init__(self):
         self.news_api_key = os.getenv("NEWS_API_KEY")
         self.newsapi = None
         if not self.news_api_key:
             logger.error("NEWS_API_KEY environment variable is not set")
+        elif self._key_validated.get(self.news_api_key) is False:
+            self.news_api_key = None
         else:
-            try:
-                self.newsapi = NewsApiClient(api_key=self.news_api_key)
-                # Validate API key with a simple request
-                self.newsapi.get_sources()
-                logger.info("Successfully initialized NewsAPI client")
-            except NewsAPIException as e:
-                logger.error(f"Failed to initialize NewsAPI client: {str(e)}")
-                self.newsapi = None
-                self.news_api_key = None
+            # The key is validated on first use, see _validate_key
+            self.newsapi = NewsApiClient(api_key=self.news_api_key)
+
+    def _validate_key(self) -> bool:
+        """
+        Check the API key with a simple request the first time it is used. Returns whether
+        NewsAPI can be queried for this call; a rejected key disables NewsAPI for good, while
+        any other failure only skips it for this call and is retried next time.
+        """
+        if not self.newsapi:
+            return False
+        if self._key_validated.get(self.news_api_key):
+            return True
+        try:
+            self.newsapi.get_sources()
+        except NewsAPIException as e:
+            # The exception wraps NewsAPI's error body, e.g. {"status": "error", "code": ...}
+            error = e.get_exception()
+            if not isinstance(error, dict) or error.get("code") not in NEWSAPI_AUTH_ERROR_CODES:
+                logger.error(f"NewsAPI key check failed, will retry on next use: {str(e)}")
+                return False
+            logger.error(f"Failed to initialize NewsAPI client: {str(e)}")
+            self._key_validated[self.news_api_key] = False
+            self.newsapi = None
+            self.news_api_key = None
+            return False
+        except Exception as e:
+            logger.error(f"NewsAPI key check failed, will retry on next use: {str(e)}")
+            return False
+        self._key_validated[self.news_api_key] = True
+        logger.info("Successfully initialized NewsAPI client")
+        return True
 
     def collect_news(self, topics: List[str], days_back: int = 1, articles_per_topic: int = 5) -> List[Dict[str, Any]]:
         """
         Collect news articles from various sources based on specified topics.
+        Blocking wrapper around collect_news_async for callers without an event loop.
+        """
+        return asyncio.run(self.collect_news_async(topics, days_back, articles_per_topic))
+
+    async def collect_news_async(self, topics: List[str], days_back: int = 1, articles_per_topic: int = 5) -> List[Dict[str, Any]]:
+        """
+        Collect news articles from various sources based on specified topics.
+        The topics are queried together, then any topic that got fewer than articles_per_topic
+        articles that way is queried on its own, concurrently.
         """
         logger.info(f"Collecting news for topics: {topics}")
         all_articles = []
-        
-        if self.newsapi:
+        if await asyncio.to_thread(self._validate_key):
             # Get current date for "from" parameter
-            from_date = time.strftime("%Y-%m-%d", time.localtime(time.time() - days_back * 86400))
+            from_date = (date.today() - timedelta(days=days_back)).isoformat()
             
-            for topic in topics:
-                try:
-                    # Make request using NewsAPI client
-                    response = self.newsapi.get_everything(
-                        q=topic,
-                        from_param=from_date,
-                        sort_by='relevancy',
-                        language='en',
-                        page_size=articles_per_topic
-                    )
-                    
-                    if response["status"] == "ok":
-                        # Add topic to each article for reference
-                        for article in response["articles"]:
-                            article["topic"] = topic
-                        
-                        all_articles.extend(response["articles"])
-                        logger.info(f"Retrieved {len(response['articles'])} articles for topic '{topic}'")
-                    else:
-                        logger.warning(f"News API returned non-ok status: {response['status']}")
-                        
-                except NewsAPIException as e:
-                    logger.error(f"NewsAPI error for topic '{topic}': {str(e)}")
-                except Exception as e:
-                    logger.error(f"Unexpected error collecting news for topic '{topic}': {str(e)}")
-                    
-                # Add a small delay to avoid hitting rate limits
-                time.sleep(0.5)
+            # Limit the requests in flight to avoid hitting rate limits
+            semaphore = asyncio.Semaphore(NEWSAPI_MAX_CONCURRENT_REQUESTS)
+            async with aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=10),
+                timeout=aiohttp.ClientTimeout(total=30),
+                headers={"X-Api-Key": self.news_api_key}
+            ) as session:
+                # Query all uncached topics with one OR request first; the topics it
+                # fills are cached, so _fetch_topic only queries the rest
+                with self._articles_cache_lock:
+                    uncached = [topic for topic in topics
+                                if (topic, from_date, articles_per_topic) not in self._articles_cache]
+                if len(uncached) > 1:
+                    await self._fetch_combined(session, semaphore, uncached, from_date, articles_per_topic)
+                
+                results = await asyncio.gather(*[
+                    self._fetch_topic(session, semaphore, topic, from_date, articles_per_topic)
+                    for topic in topics
+                ])
+            for articles in results:
+                all_articles.extend(articles)
         
         # If we don't have NEWS_API_KEY or no articles were found, use fallback data
         if not self.newsapi or not all_articles:
@@ -75,28 +125,118 @@ class NewsCollector:
                 logger.warning("No articles found - using fallback mock news data")
             all_articles = self._generate_mock_news(topics)
         
-        # Deduplicate based on URL and shuffle
-        unique_articles = {article["url"]: article for article in all_articles}
-        result = list(unique_articles.values())
+        # Deduplicate based on URL, keeping the first occurrence, and shuffle
+        seen_urls = set()
+        result = []
+        for article in all_articles:
+            if article["url"] not in seen_urls:
+                seen_urls.add(article["url"])
+                result.append(article)
         random.shuffle(result)
         
         return result
 
+    async def _fetch_combined(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                              topics: List[str], from_date: str, page_size: int) -> None:
+        """
+        Query NewsAPI once for all topics, assign each article to the first topic its title
+        or description mentions, and cache the topics that got page_size articles. Topics that
+        got fewer are left for _fetch_topic, so a popular topic can't crowd out the others
+        """
+        # Quote each topic so multi-word topics match as phrases
+        query = " OR ".join('"' + topic.replace('"', '') + '"' for topic in topics)
+        try:
+            async with semaphore:
+                async with session.get(NEWSAPI_EVERYTHING_URL, params={
+                    "q": query,
+                    "from": from_date,
+                    "sortBy": "relevancy",
+                    "language": "en",
+                    "pageSize": min(page_size * len(topics), NEWSAPI_MAX_PAGE_SIZE)
+                }) as response:
+                    data = await response.json(content_type=None)
+        except Exception as e:
+            logger.error(f"Unexpected error collecting news for topics {topics}: {str(e)}")
+            return
+        
+        if data.get("status") != "ok":
+            logger.error(f"NewsAPI error for topics {topics}: {data}")
+            return
+        
+        by_topic = {topic: [] for topic in topics}
+        lowered = [(topic, topic.lower()) for topic in topics]
+        for article in data["articles"]:
+            text = f"{article.get('title') or ''} {article.get('description') or ''}".lower()
+            for topic, needle in lowered:
+                if needle in text and len(by_topic[topic]) < page_size:
+                    article["topic"] = topic
+                    by_topic[topic].append(article)
+                    break
+        
+        with self._articles_cache_lock:
+            for topic, articles in by_topic.items():
+                if len(articles) >= page_size:
+                    logger.info(f"Retrieved {len(articles)} articles for topic '{topic}'")
+                    self._articles_cache[(topic, from_date, page_size)] = articles
+
+    async def _fetch_topic(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                           topic: str, from_date: str, page_size: int) -> List[Dict[str, Any]]:
+        """Query NewsAPI's everything endpoint for one topic; returns [] on failure"""
+        cache_key = (topic, from_date, page_size)
+        with self._articles_cache_lock:
+            cached = self._articles_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"Using {len(cached)} cached articles for topic '{topic}'")
+            return list(cached)
+        
+        try:
+            async with semaphore:
+                async with session.get(NEWSAPI_EVERYTHING_URL, params={
+                    "q": topic,
+                    "from": from_date,
+                    "sortBy": "relevancy",
+                    "language": "en",
+                    "pageSize": page_size
+                }) as response:
+                    data = await response.json(content_type=None)
+            
+            if data.get("status") == "ok":
+                # Add topic to each article for reference
+                for article in data["articles"]:
+                    article["topic"] = topic
+                
+                logger.info(f"Retrieved {len(data['articles'])} articles for topic '{topic}'")
+                with self._articles_cache_lock:
+                    self._articles_cache[cache_key] = data["articles"]
+                return list(data["articles"])
+            
+            logger.error(f"NewsAPI error for topic '{topic}': {data}")
+        except Exception as e:
+            logger.error(f"Unexpected error collecting news for topic '{topic}': {str(e)}")
+        return []
+
     def _generate_mock_news(self, topics: List[str]) -> List[Dict[str, Any]]:
         """Generate mock news data for development purposes"""
         mock_articles = []
+        published_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
         
         for topic in topics:
+            # Only the title, url and source differ between a topic's articles
+            description = f"This is a mock article about {topic} with important information and updates."
+            content = f"Lorem ipsum dolor sit amet, consectetur adipiscing elit. Sed do eiusmod tempor incididunt ut labore et dolore magna aliqua. This article discusses {topic} in detail with analysis and expert opinions."
+            url_prefix = f"https://mock-news.example/article/{topic.replace(' ', '-')}-"
+            title_prefix = f"Latest developments in {topic} - Article "
+            
             for i in range(5):  # Generate 5 articles per topic
                 mock_articles.append({
                     "source": {"id": f"source-{i}", "name": f"Mock Source {i}"},
                     "author": f"Author {i}",
-                    "title": f"Latest developments in {topic} - Article {i+1}",
-                    "description": f"This is a mock article about {topic} with important information and updates.",
-                    "url": f"https://mock-news.example/article/{topic.replace(' ', '-')}-{i}",
+                    "title": f"{title_prefix}{i+1}",
+                    "description": description,
+                    "url": f"{url_prefix}{i}",
                     "urlToImage": None,
-                    "publishedAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-                    "content": f"Lorem ipsum dolor sit amet, consectetur adipiscing elit. Sed do eiusmod tempor incididunt ut labore et dolore magna aliqua. This article discusses {topic} in detail with analysis and expert opinions.",
+                    "publishedAt": published_at,
+                    "content": content,
                     "topic": topic
                 })
         
@@ -0,0 +1,24 @@
+import os
+from functools import lru_cache
+from typing import Optional
+from supabase import create_client, Client
+from supabase.lib.client_options import ClientOptions
+
+@lru_cache(maxsize=1)
+def get_supabase() -> Optional[Client]:
+    """
+    Return the shared service-role Supabase client used by the maintenance scripts.
+
+    The client is created once per process so repeated calls reuse its HTTP
+    connections. Returns None if VITE_SUPABASE_URL or SUPABASE_SERVICE_ROLE_KEY
+    is not set.
+    """
+    supabase_url = os.getenv("VITE_SUPABASE_URL")
+    supabase_service_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+    if not supabase_url or not supabase_service_key:
+        return None
+    return create_client(
+        supabase_url,
+        supabase_service_key,
+        options=ClientOptions(postgrest_client_timeout=30)
+    )
@@ -1,32 +1,169 @@
 import os
 import logging
 import yaml
-from typing import Dict, Any, List
+from typing import Dict, Any, FrozenSet, List, Optional
 import re
+import time
+import uuid
+import threading
+import hashlib
+import orjson
 from datetime import datetime
 import requests
+import httpx
+from functools import lru_cache
 from fastapi import HTTPException
 
+# Use libyaml's C parser when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
 logger = logging.getLogger("ai-podcast-producer")
 
+# Patterns used by clean_text_for_tts
+WHITESPACE_RE = re.compile(r'\s+')
+SENTENCE_END_RE = re.compile(r'([.!?])\s+')
+UNSUPPORTED_CHARS_RE = re.compile(r'[^\w\s.,!?-]')
+
+def _read_config_file(path: str) -> Any:
+    """Parse a .json file with orjson and anything else as YAML."""
+    if path.endswith(".json"):
+        with open(path, "rb") as file:
+            return orjson.loads(file.read())
+    with open(path, "r") as file:
+        return yaml.load(file, Loader=YamlLoader)
+
 def load_config(config_path: str) -> Dict[str, Any]:
     """
-    Load configuration from YAML file.
+    Load configuration from a YAML or JSON file.
     
     Args:
-        config_path: Path to the YAML configuration file
+        config_path: Path to the YAML (or .json) configuration file
         
     Returns:
         Dict containing the configuration
     """
     try:
-        with open(config_path, "r") as file:
-            config = yaml.safe_load(file)
-        return config
+        return _read_config_file(config_path)
     except Exception as e:
         logger.error(f"Error loading config from {config_path}: {str(e)}")
         return {}
 
+@lru_cache(maxsize=1)
+def get_openai_http_client() -> httpx.Client:
+    """
+    Get the pooled HTTP client shared by every OpenAI client in the process.
+    
+    Returns:
+        httpx.Client: Keep-alive HTTP/2 client for api.openai.com
+    """
+    return httpx.Client(
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+        timeout=httpx.Timeout(connect=5.0, read=60.0, write=10.0, pool=5.0),
+        http2=True
+    )
+
+# On-disk cache of chat completion replies, keyed by the full request. Entries expire
+# after LLM_CACHE_TTL seconds, and the oldest are evicted beyond LLM_CACHE_MAX_BYTES.
+LLM_CACHE_DIR = "data/llm_cache"
+LLM_CACHE_TTL = 7 * 24 * 3600
+LLM_CACHE_MAX_BYTES = 256 * 1024 * 1024
+# Minimum seconds between two prunes of the cache directory
+LLM_CACHE_PRUNE_INTERVAL = 3600
+
+_llm_cache_pruned_at = 0.0
+_llm_cache_prune_lock = threading.Lock()
+
+def _llm_cache_file(request: Dict[str, Any]) -> str:
+    key = hashlib.sha256(orjson.dumps(request, option=orjson.OPT_SORT_KEYS)).hexdigest()
+    return os.path.join(LLM_CACHE_DIR, f"{key}.txt")
+
+def _remove_file(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+def get_cached_completion(request: Dict[str, Any]) -> Optional[str]:
+    """
+    Look up the reply to a chat completion request made in the last week.
+    
+    Args:
+        request: The keyword arguments passed to chat.completions.create
+        
+    Returns:
+        The cached reply, or None on a miss
+    """
+    cache_file = _llm_cache_file(request)
+    try:
+        if time.time() - os.path.getmtime(cache_file) > LLM_CACHE_TTL:
+            _remove_file(cache_file)
+            return None
+        with open(cache_file, "r", encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return None
+
+def set_cached_completion(request: Dict[str, Any], reply: str) -> None:
+    """
+    Store the reply to a chat completion request for get_cached_completion.
+    
+    Args:
+        request: The keyword arguments passed to chat.completions.create
+        reply: The reply text to cache
+    """
+    cache_file = _llm_cache_file(request)
+    tmp_file = f"{cache_file}.{uuid.uuid4().hex}.tmp"
+    try:
+        os.makedirs(LLM_CACHE_DIR, exist_ok=True)
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            f.write(reply)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        logger.warning(f"Could not cache completion: {str(e)}")
+        _remove_file(tmp_file)
+    _prune_llm_cache()
+
+def _prune_llm_cache():
+    """
+    Delete expired LLM cache entries, then the oldest ones while the cache is over
+    LLM_CACHE_MAX_BYTES. Runs at most once per LLM_CACHE_PRUNE_INTERVAL per process.
+    """
+    global _llm_cache_pruned_at
+    now = time.time()
+    with _llm_cache_prune_lock:
+        if now - _llm_cache_pruned_at < LLM_CACHE_PRUNE_INTERVAL:
+            return
+        _llm_cache_pruned_at = now
+    
+    entries = []
+    try:
+        with os.scandir(LLM_CACHE_DIR) as it:
+            for entry in it:
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                # Leftover temp files from an interrupted write are only removed once
+                # they're old enough not to belong to a write in progress
+                if now - stat.st_mtime > LLM_CACHE_TTL or (
+                        entry.name.endswith(".tmp") and now - stat.st_mtime > LLM_CACHE_PRUNE_INTERVAL):
+                    _remove_file(entry.path)
+                elif entry.name.endswith(".txt"):
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+    except OSError as e:
+        logger.warning(f"Could not prune LLM cache: {str(e)}")
+        return
+    
+    total_size = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total_size <= LLM_CACHE_MAX_BYTES:
+            break
+        _remove_file(path)
+        total_size -= size
+
 def ensure_directories_exist(paths: List[str]):
     """
     Ensure all required directories exist, create them if they don't.
@@ -34,10 +171,16 @@ def ensure_directories_exist(paths: List[str]):
     Args:
         paths: List of directory paths to check/create
     """
-    for path in paths:
+    # Deepest paths first: makedirs creates their parents too, so a path that is the
+    # parent of one already created can be skipped
+    created = []
+    for path in sorted({os.path.normpath(path) for path in paths}, key=len, reverse=True):
+        if any(done.startswith(path + os.sep) for done in created):
+            continue
         try:
             os.makedirs(path, exist_ok=True)
-            logger.info(f"Ensured directory exists: {path}")
+            created.append(path)
+            logger.debug("Ensured directory exists: %s", path)
         except Exception as e:
             logger.error(f"Error creating directory {path}: {str(e)}")
 
@@ -51,36 +194,58 @@ def handle_elevenlabs_error(response: requests.Response) -> None:
     Raises:
         HTTPException with appropriate status code and message
     """
+    # These responses don't need the error body, so it isn't parsed
+    status_code = response.status_code
+    if status_code == 401:
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid ElevenLabs API key"
+        )
+    if status_code == 429:
+        raise HTTPException(
+            status_code=429,
+            detail="ElevenLabs API rate limit exceeded"
+        )
+    
     try:
         error_data = response.json()
-        error_message = error_data.get("detail", {}).get("message", str(error_data))
-        
-        status_code = response.status_code
-        if status_code == 401:
-            raise HTTPException(
-                status_code=401,
-                detail="Invalid ElevenLabs API key"
-            )
-        elif status_code == 422:
-            raise HTTPException(
-                status_code=422,
-                detail=f"Invalid request to ElevenLabs API: {error_message}"
-            )
-        elif status_code == 429:
-            raise HTTPException(
-                status_code=429,
-                detail="ElevenLabs API rate limit exceeded"
-            )
+        detail = error_data.get("detail") if isinstance(error_data, dict) else None
+        if isinstance(detail, dict):
+            error_message = detail.get("message", str(error_data))
         else:
-            raise HTTPException(
-                status_code=status_code,
-                detail=f"ElevenLabs API error: {error_message}"
-            )
+            error_message = str(error_data)
     except ValueError:
         raise HTTPException(
-            status_code=response.status_code,
+            status_code=status_code,
             detail=f"ElevenLabs API error: {response.text}"
         )
+    
+    if status_code == 422:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Invalid request to ElevenLabs API: {error_message}"
+        )
+    raise HTTPException(
+        status_code=status_code,
+        detail=f"ElevenLabs API error: {error_message}"
+    )
+
+@lru_cache(maxsize=4)
+def _load_voice_ids(voices_file: str, mtime: float) -> FrozenSet[str]:
+    """
+    Parse the voice IDs out of a voices configuration file. mtime is only part of the
+    cache key, so an edited file is parsed again.
+    """
+    voices = _read_config_file(voices_file)
+    
+    # Collect all voice lists in the configuration
+    voice_ids = set()
+    for language in voices.values():
+        if isinstance(language, dict):
+            for gender in language.values():
+                if isinstance(gender, list):
+                    voice_ids.update(gender)
+    return frozenset(voice_ids)
 
 def validate_voice_id(voice_id: str, voices_file: str) -> bool:
     """
@@ -94,16 +259,7 @@ def validate_voice_id(voice_id: str, voices_file: str) -> bool:
         bool: True if voice ID is valid, False otherwise
     """
     try:
-        with open(voices_file, 'r') as f:
-            voices = yaml.safe_load(f)
-            
-        # Check all voice lists in the configuration
-        for language in voices.values():
-            if isinstance(language, dict):
-                for gender in language.values():
-                    if isinstance(gender, list) and voice_id in gender:
-                        return True
-        return False
+        return voice_id in _load_voice_ids(voices_file, os.path.getmtime(voices_file))
         
     except Exception as e:
         logger.error(f"Error validating voice ID: {str(e)}")
@@ -120,10 +276,14 @@ def get_directory_size(directory: str) -> int:
         int: Total size in bytes
     """
     total_size = 0
-    for dirpath, dirnames, filenames in os.walk(directory):
-        for filename in filenames:
-            filepath = os.path.join(dirpath, filename)
-            total_size += os.path.getsize(filepath)
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                # Like os.walk, don't descend into symlinked directories
+                if not entry.is_symlink():
+                    total_size += get_directory_size(entry.path)
+            else:
+                total_size += entry.stat().st_size
     return total_size
 
 def format_duration(seconds: int) -> str:
@@ -163,16 +323,16 @@ def clean_text_for_tts(text: str) -> str:
         str: Cleaned text optimized for TTS
     """
     # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text)
+    text = WHITESPACE_RE.sub(' ', text)
     
     # Add pauses after sentences
-    text = re.sub(r'([.!?])\s+', r'\1... ', text)
+    text = SENTENCE_END_RE.sub(r'\1... ', text)
     
     # Add slight pauses for commas
     text = text.replace(',', ', ')
     
     # Remove any special characters that might cause issues
-    text = re.sub(r'[^\w\s.,!?-]', '', text)
+    text = UNSUPPORTED_CHARS_RE.sub('', text)
     
     return text.strip()
 
@@ -40,4 +40,24 @@ ON podcasts
 USING (auth.role() = 'service_role');
 
 -- Add table comment
-COMMENT ON TABLE podcasts IS 'Table for storing podcast information with RLS policies for user data protection';
\ No newline at end of file
+COMMENT ON TABLE podcasts IS 'Table for storing podcast information with RLS policies for user data protection';
+
+-- Upsert a JSON array of podcast rows in one call (used by data/sync_podcasts.py).
+-- Existing podcasts only have their generated content and status updated.
+CREATE OR REPLACE FUNCTION public.sync_podcasts(rows jsonb)
+RETURNS void
+LANGUAGE sql
+AS $$
+  INSERT INTO public.podcasts (id, user_id, status, url, metadata, transcript, duration, topics, host_voice, co_host_voice, language)
+  SELECT id, user_id, status, url, metadata, transcript, duration, topics, host_voice, co_host_voice, language
+  FROM jsonb_to_recordset(rows) AS t(
+    id UUID, user_id TEXT, status TEXT, url TEXT, metadata JSONB, transcript TEXT,
+    duration INTEGER, topics TEXT[], host_voice TEXT, co_host_voice TEXT, language TEXT
+  )
+  ON CONFLICT (id) DO UPDATE SET
+    status = EXCLUDED.status,
+    url = EXCLUDED.url,
+    metadata = EXCLUDED.metadata,
+    transcript = EXCLUDED.transcript,
+    topics = EXCLUDED.topics;
+$$;
@@ -1,10 +1,14 @@
 import os
 import sys
 import logging
+import asyncio
 from dotenv import load_dotenv
 from openai import OpenAI
 import requests
+import httpx
+from requests.adapters import HTTPAdapter
 import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Add parent directory to path to import our modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -16,6 +20,10 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
+# Shared keep-alive session for the NewsAPI check
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=10))
+
 def test_openai_api():
     """Test OpenAI API connectivity"""
     try:
@@ -44,49 +52,46 @@ def test_elevenlabs_api():
         if not eleven_api_key:
             return False, "ElevenLabs API key not found in environment variables"
         
-        # First test with voices endpoint to verify authentication
-        voices_url = "https://api.elevenlabs.io/v1/voices"
-        headers = {
-            "xi-api-key": eleven_api_key
-        }
-        
-        voices_response = requests.get(voices_url, headers=headers)
-        
-        if voices_response.status_code != 200:
-            return False, f"Failed to authenticate with ElevenLabs API: {voices_response.text}"
-            
-        # If authentication is successful, try a minimal text-to-speech conversion
-        voice_id = "21m00Tcm4TlvDq8ikWAM"  # Default "Rachel" voice
-        
-        url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}"
-        headers = {
-            "xi-api-key": eleven_api_key,
-            "Content-Type": "application/json"
-        }
-        
-        payload = {
-            "text": "This is a test.",
-            "model_id": "eleven_multilingual_v2"
-        }
-        
-        response = requests.post(url, json=payload, headers=headers)
-        
-        if response.status_code == 200:
-            return True, "ElevenLabs API test successful"
-            
-        error_msg = response.text
-        try:
-            error_data = response.json()
-            if "detail" in error_data:
-                error_msg = error_data["detail"]
-        except:
-            pass
-            
-        return False, f"ElevenLabs API error: {error_msg}"
+        return asyncio.run(_check_elevenlabs(eleven_api_key))
     
     except Exception as e:
         return False, f"ElevenLabs API test failed: {str(e)}"
 
+async def _check_elevenlabs(eleven_api_key):
+    """Send the voices and text-to-speech checks concurrently over one HTTP/2 connection"""
+    # The voices endpoint verifies authentication
+    voices_url = "https://api.elevenlabs.io/v1/voices"
+    
+    # A minimal text-to-speech conversion
+    voice_id = "21m00Tcm4TlvDq8ikWAM"  # Default "Rachel" voice
+    url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}"
+    payload = {
+        "text": "This is a test.",
+        "model_id": "eleven_multilingual_v2"
+    }
+    
+    async with httpx.AsyncClient(http2=True, timeout=30, headers={"xi-api-key": eleven_api_key}) as client:
+        voices_response, response = await asyncio.gather(
+            client.get(voices_url),
+            client.post(url, json=payload)
+        )
+    
+    if voices_response.status_code != 200:
+        return False, f"Failed to authenticate with ElevenLabs API: {voices_response.text}"
+    
+    if response.status_code == 200:
+        return True, "ElevenLabs API test successful"
+        
+    error_msg = response.text
+    try:
+        error_data = response.json()
+        if "detail" in error_data:
+            error_msg = error_data["detail"]
+    except:
+        pass
+        
+    return False, f"ElevenLabs API error: {error_msg}"
+
 def test_newsapi():
     """Test NewsAPI connectivity"""
     try:
@@ -104,7 +109,7 @@ def test_newsapi():
             "pageSize": 1
         }
         
-        response = requests.get(url, params=params)
+        response = SESSION.get(url, params=params)
         
         if response.status_code == 200:
             data = response.json()
@@ -118,20 +123,18 @@ def test_newsapi():
 
 def main():
     """Run all API tests"""
-    # Test OpenAI API
-    logger.info("Testing OpenAI API...")
-    success, message = test_openai_api()
-    logger.info(f"OpenAI API: {message}")
-    
-    # Test ElevenLabs API
-    logger.info("\nTesting ElevenLabs API...")
-    success, message = test_elevenlabs_api()
-    logger.info(f"ElevenLabs API: {message}")
-    
-    # Test NewsAPI
-    logger.info("\nTesting NewsAPI...")
-    success, message = test_newsapi()
-    logger.info(f"NewsAPI: {message}")
+    # The tests are independent, so run them at the same time and report each as it finishes
+    tests = [
+        ("OpenAI API", test_openai_api),
+        ("ElevenLabs API", test_elevenlabs_api),
+        ("NewsAPI", test_newsapi),
+    ]
+    logger.info(f"Testing {', '.join(name for name, _ in tests)}...")
+    with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+        futures = {executor.submit(test): name for name, test in tests}
+        for future in as_completed(futures):
+            success, message = future.result()
+            logger.info(f"{futures[future]}: {message}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,30 @@
+import os
+import logging
+from dotenv import load_dotenv
+from arq.connections import RedisSettings
+
+# Load environment variables before the API modules read them
+load_dotenv()
+
+from api.routes import generate_podcast
+
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO"),
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+async def generate_podcast_job(ctx, **job):
+    """ARQ job wrapper around the podcast generation pipeline."""
+    await generate_podcast(**job)
+
+class WorkerSettings:
+    """
+    ARQ worker for podcast generation. Run with:
+
+        arq worker.WorkerSettings
+    """
+    functions = [generate_podcast_job]
+    redis_settings = RedisSettings.from_dsn(os.getenv("REDIS_URL", "redis://localhost:6379"))
+    # A long podcast can take several minutes of LLM and TTS calls
+    job_timeout = 1800
+    max_tries = 1